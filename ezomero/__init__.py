@@ -2,7 +2,10 @@ from ._ezomero import (put_map_annotation,
                        put_description,
                        connect,
                        store_connection_params,
-                       set_group)
+                       set_group,
+                       close_all,
+                       reconnect,
+                       invalidate_group_cache)
 from ._misc import (filter_by_filename,
                     filter_by_kv,
                     filter_by_tag_value,
@@ -25,18 +28,24 @@ from ._posts import (post_dataset,
                      post_table)
 from ._gets import (get_image,
                     get_image_ids,
+                    get_image_ids_batch,
                     get_project_ids,
                     get_dataset_ids,
                     get_screen_ids,
                     get_plate_ids,
                     get_well_ids,
+                    iter_well_ids,
                     get_plate_acquisition_ids,
+                    iter_plate_acquisition_ids,
                     get_map_annotation_ids,
                     get_map_annotation,
+                    get_map_annotations,
                     get_file_annotation_ids,
                     get_well_id,
                     get_roi_ids,
                     get_shape_ids,
+                    iter_shape_ids,
+                    get_roi_shape_map,
                     get_file_annotation,
                     get_tag_ids,
                     get_tag,
@@ -48,7 +57,13 @@ from ._gets import (get_image,
                     get_series_index,
                     get_pyramid_levels,
                     get_table,
-                    get_shape)
+                    get_shape,
+                    get_shapes)
+from ._async import (aget_original_filepaths,
+                     aget_well_ids,
+                     aget_plate_acquisition_ids,
+                     aget_roi_ids,
+                     aget_shape_ids)
 
 __all__ = ['post_dataset',
            'post_image',
@@ -61,18 +76,24 @@ __all__ = ['post_dataset',
            'post_table',
            'get_image',
            'get_image_ids',
+           'get_image_ids_batch',
            'get_project_ids',
            'get_dataset_ids',
            'get_screen_ids',
            'get_plate_ids',
            'get_well_ids',
+           'iter_well_ids',
            'get_plate_acquisition_ids',
+           'iter_plate_acquisition_ids',
            'get_map_annotation_ids',
            'get_map_annotation',
+           'get_map_annotations',
            'get_file_annotation_ids',
            'get_well_id',
            'get_roi_ids',
            'get_shape_ids',
+           'iter_shape_ids',
+           'get_roi_shape_map',
            'get_file_annotation',
            'get_tag_ids',
            'get_tag',
@@ -85,6 +106,12 @@ __all__ = ['post_dataset',
            'get_pyramid_levels',
            'get_table',
            'get_shape',
+           'get_shapes',
+           'aget_original_filepaths',
+           'aget_well_ids',
+           'aget_plate_acquisition_ids',
+           'aget_roi_ids',
+           'aget_shape_ids',
            'put_map_annotation',
            'put_description',
            'filter_by_filename',
@@ -100,4 +127,7 @@ __all__ = ['post_dataset',
            'ezimport',
            'connect',
            'store_connection_params',
-           'set_group']
+           'set_group',
+           'close_all',
+           'reconnect',
+           'invalidate_group_cache']
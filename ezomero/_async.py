@@ -0,0 +1,212 @@
+import asyncio
+import functools
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Literal, Optional, Tuple
+from typing import Union
+from omero.gateway import BlitzGateway
+from ._gets import get_original_filepaths, get_well_ids
+from ._gets import get_plate_acquisition_ids, get_roi_ids, get_shape_ids
+
+
+# maximum number of server calls run at the same time by the ``aget_*``
+# coroutines
+MAX_ASYNC_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# per connection: the `_GroupTurns` of its running and waiting calls. The
+# lock only guards this bookkeeping, never a server call or a wait.
+_group_turns: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_group_turns_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all ``aget_*`` coroutines."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_ASYNC_WORKERS,
+                                           thread_name_prefix='ezomero')
+        return _executor
+
+
+class _GroupTurns:
+    """Calls on one connection, taking turns by group context.
+
+    ``do_across_groups`` switches ``conn.SERVICE_OPTS`` to group -1 and back
+    around each call, which is not safe when several calls share the
+    connection at once: the first one to finish would restore the group
+    under the others, and a call meant for the current group only could run
+    while another has switched to -1. Here calls of the same kind run
+    together, with the first one in switching and the last one out
+    restoring. A call of the other kind waits, in its coroutine, until they
+    are done; calls arriving after it wait behind it, so neither kind can
+    hold the connection forever.
+    """
+
+    def __init__(self) -> None:
+        self.across_groups = False
+        self.running = 0
+        # group to put back once the running calls are done, if switched
+        self.switched = False
+        self.restore = None
+        # (across_groups, future) of waiting calls, in arrival order
+        self.waiting: deque = deque()
+
+    def admit(self, conn: BlitzGateway, across_groups: bool) -> None:
+        """Count a call as running, switching groups for the first one."""
+        if self.running == 0:
+            self.across_groups = across_groups
+            svc = conn.SERVICE_OPTS
+            # the group is read from the local context, not the server
+            group = svc.getOmeroGroup()
+            if across_groups and str(group) != '-1':
+                self.switched, self.restore = True, group
+                svc.setOmeroGroup('-1')
+        self.running += 1
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def _enter(conn: BlitzGateway, across_groups: bool) -> None:
+    """Wait until a call in this group context may run on `conn`."""
+    with _group_turns_lock:
+        turns = _group_turns.get(conn)
+        if turns is None:
+            turns = _group_turns[conn] = _GroupTurns()
+        if not turns.waiting and (turns.running == 0
+                                  or turns.across_groups == across_groups):
+            turns.admit(conn, across_groups)
+            return
+        future = asyncio.get_running_loop().create_future()
+        turns.waiting.append((across_groups, future))
+    try:
+        await future
+    except asyncio.CancelledError:
+        with _group_turns_lock:
+            try:
+                turns.waiting.remove((across_groups, future))
+                admitted = False
+            except ValueError:
+                admitted = True
+        if admitted:
+            _leave(conn)
+        raise
+
+
+def _leave(conn: BlitzGateway) -> None:
+    """Count a call as done, letting the next waiting calls in."""
+    with _group_turns_lock:
+        turns = _group_turns[conn]
+        turns.running -= 1
+        if turns.running:
+            return
+        if turns.switched:
+            conn.SERVICE_OPTS.setOmeroGroup(turns.restore)
+            turns.switched, turns.restore = False, None
+        if not turns.waiting:
+            del _group_turns[conn]
+            return
+        # let in the next call, with any calls of its kind queued behind it
+        across_groups = turns.waiting[0][0]
+        while turns.waiting and turns.waiting[0][0] == across_groups:
+            _, future = turns.waiting.popleft()
+            turns.admit(conn, across_groups)
+            future.get_loop().call_soon_threadsafe(_wake, future)
+
+
+async def _run(f: Callable, conn: BlitzGateway, *args,
+               across_groups: Optional[bool] = True, **kwargs):
+    """Run the blocking getter `f` on the shared thread pool.
+
+    The call only takes a worker thread once it is its turn on `conn`.
+    """
+    across_groups = bool(across_groups)
+    await _enter(conn, across_groups)
+    try:
+        done = _get_executor().submit(functools.partial(
+            f, conn, *args, across_groups=across_groups, **kwargs))
+    except BaseException:
+        _leave(conn)
+        raise
+    # released when the call is actually over, even if the coroutine is
+    # cancelled while it runs
+    done.add_done_callback(lambda _: _leave(conn))
+    return await asyncio.wrap_future(done)
+
+
+async def aget_original_filepaths(
+    conn: BlitzGateway, image_id: int,
+    fpath: Optional[Literal["client", "repo"]] = 'repo',
+    split: bool = False,
+    across_groups: Optional[bool] = True
+) -> Union[List[str], List[Tuple[str, str]]]:
+    """Coroutine version of ``get_original_filepaths``.
+
+    Each server call still takes a full round-trip, but calls gathered
+    together run concurrently instead of one after the other.
+
+    Examples
+    --------
+    # Fetch the ROIs and original file paths of an image at the same time:
+
+    >>> roi_ids, paths = await asyncio.gather(
+    ...     aget_roi_ids(conn, 42),
+    ...     aget_original_filepaths(conn, 42))
+    """
+    return await _run(get_original_filepaths, conn, image_id, fpath=fpath,
+                      split=split, across_groups=across_groups)
+
+
+async def aget_well_ids(conn: BlitzGateway, screen: Optional[int] = None,
+                        plate: Optional[int] = None,
+                        annotation: Optional[int] = None,
+                        across_groups: Optional[bool] = True) -> List[int]:
+    """Coroutine version of ``get_well_ids``.
+
+    See ``aget_original_filepaths`` for an example.
+    """
+    return await _run(get_well_ids, conn, screen=screen, plate=plate,
+                      annotation=annotation, across_groups=across_groups)
+
+
+async def aget_plate_acquisition_ids(
+    conn: BlitzGateway, screen: Optional[int] = None,
+    plate: Optional[int] = None, annotation: Optional[int] = None,
+    across_groups: Optional[bool] = True
+) -> List[int]:
+    """Coroutine version of ``get_plate_acquisition_ids``.
+
+    See ``aget_original_filepaths`` for an example.
+    """
+    return await _run(get_plate_acquisition_ids, conn, screen=screen,
+                      plate=plate, annotation=annotation,
+                      across_groups=across_groups)
+
+
+async def aget_roi_ids(conn: BlitzGateway, image_id: int,
+                       across_groups: Optional[bool] = True) -> List[int]:
+    """Coroutine version of ``get_roi_ids``.
+
+    See ``aget_original_filepaths`` for an example.
+    """
+    return await _run(get_roi_ids, conn, image_id,
+                      across_groups=across_groups)
+
+
+async def aget_shape_ids(conn: BlitzGateway, roi_id: int,
+                         across_groups: Optional[bool] = True
+                         ) -> Union[List[int], None]:
+    """Coroutine version of ``get_shape_ids``.
+
+    See ``aget_original_filepaths`` for an example.
+    """
+    return await _run(get_shape_ids, conn, roi_id,
+                      across_groups=across_groups)
@@ -1,13 +1,69 @@
 import configparser
+import functools
+import hashlib
 import logging
 import os
-import functools
 import inspect
-from typing import Callable, Optional, Union
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 from getpass import getpass
+from omero import ServerError
 from omero.gateway import BlitzGateway
+from omero.model import ExperimenterI
 from pathlib import Path
 
+# parsed '.ezomero' files, keyed by file path and reused for as long as the
+# file on disk is unchanged
+_config_cache: Dict[Path, Tuple[Tuple[int, int], dict]] = {}
+
+# live connections created by `connect(pool=True)`, keyed by their resolved
+# parameters, with the number of callers currently holding each of them
+_conn_pool: Dict[tuple, List] = {}
+_conn_pool_lock = threading.Lock()
+
+# resolved `connect` parameters of each connection, for `reconnect`: (group,
+# host, port, secure, pool, session UUID, (user, password) or None). The
+# password is only kept if the caller asked for it with `keep_credentials`.
+_conn_params: "weakref.WeakKeyDictionary[BlitzGateway, tuple]" = \
+    weakref.WeakKeyDictionary()
+
+# results of `set_group` membership checks, keyed by (host, port, user_id,
+# group_id) so that users of different servers are never confused
+_group_membership: Dict[tuple, bool] = {}
+
+# how `connect` resolves each parameter: (argument name, environment and
+# config key, prompt, whether it may be read from '.ezomero', conversion of
+# the resolved value). `secure` is handled separately.
+_CONN_PARAMS = (
+    ('user', 'OMERO_USER', 'Enter username: ', True, None),
+    ('password', 'OMERO_PASS', 'Enter password: ', False, None),
+    ('group', 'OMERO_GROUP',
+     'Enter group name (or leave blank for default group): ', True,
+     lambda group: group or None),
+    ('host', 'OMERO_HOST', 'Enter host: ', True, None),
+    ('port', 'OMERO_PORT', 'Enter port: ', True, int),
+)
+
+# accepted spellings when parsing booleans from prompts, env and config
+_TRUE_STRINGS = frozenset({"true", "t", "yes", "y", "1"})
+_FALSE_STRINGS = frozenset({"false", "f", "no", "n", "0"})
+
+# object types whose description can be changed by `put_description`
+_VALID_DESC_TYPES = frozenset({'Image',
+                               'Dataset',
+                               'Project',
+                               'FileAnnotation',
+                               'CommentAnnotation',
+                               'MapAnnotation',
+                               'TagAnnotation',
+                               'Plate',
+                               'Screen',
+                               'Roi',
+                               })
+
 
 def get_default_args(func: Callable) -> dict:
     """Retrieves the default arguments of a function.
@@ -30,6 +86,11 @@ def get_default_args(func: Callable) -> dict:
     }
 
 
+def _is_int(value) -> bool:
+    """Whether `value` is an integer ID (``bool`` does not count)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 def do_across_groups(f: Callable) -> object:
     """Decorator functional for making functions work across
     OMERO groups.
@@ -44,27 +105,29 @@ def do_across_groups(f: Callable) -> object:
     wrapper : Object
         Return value of the decorated function.
     """
-    @functools.wraps(f)
+    # `f` is fixed at decoration time, so inspect its signature only once
+    default_across = get_default_args(f).get('across_groups', False)
+
     def wrapper(*args, **kwargs):
-        defaults = get_default_args(f)
-        do_across_groups = False
-        # test if user is overriding default
-        if 'across_groups' in kwargs:
-            # if they are, respect user settings
-            if kwargs['across_groups']:
-                do_across_groups = True
-        else:
-            # else, respect default
-            if defaults['across_groups']:
-                do_across_groups = True
-        if do_across_groups:
-            current_group = args[0].getGroupFromContext().getId()
-            args[0].SERVICE_OPTS.setOmeroGroup('-1')
-            res = f(*args, **kwargs)
-            set_group(args[0], current_group)
-        else:
+        # test if user is overriding default, else respect default
+        if not kwargs.get('across_groups', default_across):
+            # fast path: nothing to switch, just forward the call
+            return f(*args, **kwargs)
+        conn = args[0]
+        svc = conn.SERVICE_OPTS
+        if str(svc.getOmeroGroup()) == '-1':
+            # already working across groups (e.g. nested decorated calls)
+            return f(*args, **kwargs)
+        current_group = conn.getGroupFromContext().getId()
+        svc.setOmeroGroup('-1')
+        try:
             res = f(*args, **kwargs)
+        finally:
+            # we just came from this group, so no membership check is needed
+            svc.setOmeroGroup(current_group)
         return res
+    # done once per decorated function, so it costs nothing per call
+    functools.update_wrapper(wrapper, f)
     return wrapper
 
 
@@ -109,7 +172,7 @@ def put_map_annotation(conn: BlitzGateway, map_ann_id: int, kv_dict: dict,
 
     >>> put_map_annotation(conn, 16, new_values, 'test_v2')
     """
-    if type(map_ann_id) is not int:
+    if not _is_int(map_ann_id):
         raise TypeError('Map annotation ID must be an integer')
 
     map_ann = conn.getObject('MapAnnotation', map_ann_id)
@@ -121,16 +184,10 @@ def put_map_annotation(conn: BlitzGateway, map_ann_id: int, kv_dict: dict,
         ns = map_ann.getNs()
     map_ann.setNs(ns)
 
-    kv_pairs = []
-    for k, v in kv_dict.items():
-        k = str(k)
-        if type(v) is not list:
-            v = str(v)
-            kv_pairs.append([k, v])
-        else:
-            for value in v:
-                value = str(value)
-                kv_pairs.append([k, value])
+    # list values become one kv pair per element, all under the same key
+    kv_pairs = [[str(k), str(value)]
+                for k, v in kv_dict.items()
+                for value in (v if isinstance(v, list) else (v,))]
 
     map_ann.setValue(kv_pairs)
     map_ann.save()
@@ -174,22 +231,11 @@ def put_description(conn: BlitzGateway, obj_type: str, obj_id: int, desc: str,
 
     >>> put_description(conn, 'TagAnnotation', 16, 'new tag description')
     """
-    VALID_TYPES = ['Image',
-                   'Dataset',
-                   'Project',
-                   'FileAnnotation',
-                   'CommentAnnotation',
-                   'MapAnnotation',
-                   'TagAnnotation',
-                   'Plate',
-                   'Screen',
-                   'Roi',
-                   ]
-    if type(obj_type) is not str:
+    if not isinstance(obj_type, str):
         raise TypeError('Object type must be a string')
-    if type(obj_id) is not int:
+    if not _is_int(obj_id):
         raise TypeError('Object ID must be an integer')
-    if obj_type not in VALID_TYPES:
+    if obj_type not in _VALID_DESC_TYPES:
         raise ValueError('Object type specified is not valid')
 
     obj = conn.getObject(obj_type, obj_id)
@@ -204,10 +250,158 @@ def put_description(conn: BlitzGateway, obj_type: str, obj_id: int, desc: str,
 
 # functions for managing connection context and service options.
 
+@functools.lru_cache(maxsize=None)
+def _default_config_path() -> Path:
+    """Path of the '.ezomero' file in the home directory (resolved once)."""
+    return Path.home() / '.ezomero'
+
+
+def _parse_ezomero(config_fp: Path) -> Dict[str, Dict[str, str]]:
+    """Parse an '.ezomero' file.
+
+    A minimal INI reader covering what ``store_connection_params`` writes:
+    ``[SECTION]`` headers, ``key = value`` (or ``key: value``) pairs and
+    full-line ``#``/``;`` comments. As with ``configparser``, keys are
+    case-insensitive (returned upper-case) and every section inherits the
+    entries of the DEFAULT section.
+
+    Parameters
+    ----------
+    config_fp : ``pathlib.Path``
+        Path to the '.ezomero' file.
+
+    Returns
+    -------
+    sections : dict
+        Dictionary of section name to that section's key-value pairs. Always
+        contains a 'DEFAULT' entry.
+    """
+    sections: Dict[str, Dict[str, str]] = {'DEFAULT': {}}
+    current = None
+    for lineno, line in enumerate(config_fp.read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line[0] == '[' and line[-1] == ']':
+            current = sections.setdefault(line[1:-1], {})
+            continue
+        if current is None:
+            raise ValueError(f'{config_fp}, line {lineno}: expected a '
+                             'section header')
+        # split on whichever delimiter comes first
+        seps = [i for i in (line.find('='), line.find(':')) if i > 0]
+        if not seps:
+            raise ValueError(f'{config_fp}, line {lineno}: expected '
+                             '"key = value"')
+        i = min(seps)
+        current[line[:i].strip().upper()] = line[i + 1:].strip()
+    defaults = sections['DEFAULT']
+    return {name: section if name == 'DEFAULT' else {**defaults, **section}
+            for name, section in sections.items()}
+
+
+def _read_config(config_fp: Path) -> Optional[Dict[str, Dict[str, str]]]:
+    """Read an '.ezomero' file.
+
+    Parsed files are cached and only re-read when the file's modification
+    time or size changes.
+
+    Parameters
+    ----------
+    config_fp : ``pathlib.Path``
+        Path to the '.ezomero' file.
+
+    Returns
+    -------
+    sections : dict or None
+        Dictionary of section name to that section's key-value pairs, with
+        upper-case keys. Returns None if the file does not exist.
+    """
+    try:
+        st = config_fp.stat()
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(config_fp)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    sections = _parse_ezomero(config_fp)
+    _config_cache[config_fp] = (stamp, sections)
+    return sections
+
+
+def _is_interactive() -> bool:
+    """Whether the user can be prompted for input."""
+    stdin = sys.stdin
+    if stdin is None:
+        return False
+    try:
+        if stdin.isatty():
+            return True
+    except ValueError:
+        # stdin has been closed
+        return False
+    # Jupyter kernels forward ``input`` without a TTY; a mere import of
+    # ipykernel (e.g. by a library) does not mean a kernel is running
+    ipython = sys.modules.get('IPython')
+    get_ipython = getattr(ipython, 'get_ipython', None)
+    if get_ipython is None:
+        return False
+    shell = get_ipython()
+    return getattr(shell, 'kernel', None) is not None
+
+
+def _prompt(prompt: str, env_key: str, prompt_fn: Callable = input) -> str:
+    """Ask the user for a connection parameter.
+
+    Raises ``RuntimeError`` rather than blocking forever on ``input`` when
+    there is nobody to answer, e.g. in batch jobs or pipelines. Other prompt
+    functions such as ``getpass`` are left alone, so a password can still be
+    piped in on stdin.
+    """
+    if prompt_fn is input and not _is_interactive():
+        raise RuntimeError(f'{env_key} is not set and no terminal is '
+                           'available to prompt for it')
+    return prompt_fn(prompt)
+
+
+def _resolve_param(value: Optional[str], env_key: str,
+                   config_dict: Optional[dict],
+                   prompt: Optional[str] = None,
+                   prompt_fn: Callable = input) -> Optional[str]:
+    """Resolve a connection parameter.
+
+    Precedence is: explicit value, environment variable, '.ezomero' config
+    entry and finally an interactive prompt (skipped if `prompt` is None).
+    """
+    if value is not None:
+        return value
+    value = os.environ.get(env_key)
+    if value is None and config_dict is not None:
+        value = config_dict.get(env_key)
+    if value is None and prompt is not None:
+        value = _prompt(prompt, env_key, prompt_fn)
+    return value
+
+
+def _str_to_bool(value: Optional[str]) -> Optional[bool]:
+    """Parse a 'True'/'False' string, returning None if it is neither."""
+    if value is None:
+        return None
+    value = value.lower()
+    if value in _TRUE_STRINGS:
+        return True
+    if value in _FALSE_STRINGS:
+        return False
+    return None
+
+
 def connect(user: Optional[str] = None, password: Optional[str] = None,
             group: Optional[str] = None, host: Optional[str] = None,
             port: Optional[int] = None, secure: Optional[bool] = None,
-            config_path: Optional[str] = None) -> Optional[BlitzGateway]:
+            config_path: Optional[str] = None, attempts: int = 1,
+            backoff: Sequence[float] = (0.1, 0.5, 2.0), pool: bool = False,
+            keep_credentials: bool = False) -> Optional[BlitzGateway]:
     """Create an OMERO connection
 
     This function will create an OMERO connection by populating certain
@@ -215,8 +409,17 @@ def connect(user: Optional[str] = None, password: Optional[str] = None,
     procedure described in the notes below. Note that this function may
     ask for user input, so be cautious if using in the context of a script.
 
+    With ``pool=True``, calling this function again with the same parameters
+    returns the existing connection as long as it is still alive, instead of
+    logging in again. Pooled connections are shared, so they should not be
+    used concurrently from several threads. Each such call also switches the
+    shared connection back to the group it logged in with, which undoes any
+    ``ezomero.set_group`` made by another holder.
+
     Finally, don't forget to close the connection ``conn.close()`` when it
-    is no longer needed!
+    is no longer needed, or ``ezomero.close_all()`` to close every pooled
+    connection! A pooled connection is only really closed once every caller
+    that received it has closed it.
 
     Parameters
     ----------
@@ -239,6 +442,24 @@ def connect(user: Optional[str] = None, password: Optional[str] = None,
         information. If left as ``None``, defaults to the home directory as
         determined by Python's ``pathlib``.
 
+    attempts : int, optional
+        Number of times to try logging in before giving up. Defaults to a
+        single attempt.
+
+    backoff : sequence of float, optional
+        Seconds to wait before each retry. The last value is reused if there
+        are more retries than values.
+
+    pool : bool, optional
+        Whether to share the connection with other ``connect(pool=True)``
+        calls using the same parameters. Defaults to False.
+
+    keep_credentials : bool, optional
+        Whether to keep the username and password in memory, so that
+        ``ezomero.reconnect`` can log in again once the session has ended.
+        Defaults to False, in which case ``ezomero.reconnect`` can only rejoin
+        a session that is still alive on the server.
+
     Returns
     -------
     conn : ``omero.gateway.BlitzGateway`` object or None
@@ -274,96 +495,206 @@ def connect(user: Optional[str] = None, password: Optional[str] = None,
        to discourage storing credentials in a file as cleartext.
 
     4) If any remaining parameters have not been set by the above steps, the
-       user is prompted to enter a value for each unset parameter.
+       user is prompted to enter a value for each unset parameter. If there
+       is no terminal to prompt on (e.g. in a batch job), a ``RuntimeError``
+       is raised instead of waiting for input.
     """
     if secure and not isinstance(secure, bool):
         raise TypeError("'secure' variable must be a boolean")
     # load from .ezomero config file if it exists
     if config_path is None:
-        config_fp = Path.home() / '.ezomero'
-    elif type(config_path) is str:
+        config_fp = _default_config_path()
+    elif isinstance(config_path, str):
         config_fp = Path(config_path) / '.ezomero'
     else:
         raise TypeError('config_path must be a string')
-    config_dict: Union[None, configparser.SectionProxy] = None
-    if config_fp.exists():
-        config = configparser.ConfigParser()
-        with config_fp.open() as fp:
-            config.read_file(fp)
-        config_dict = config["DEFAULT"]
-
-    # set user
-    if user is None:
-        if config_dict:
-            user = config_dict.get("OMERO_USER", user)
-        user = os.environ.get("OMERO_USER", user)
-    if user is None:
-        user = input('Enter username: ')
-
-    # set password
-    if password is None:
-        password = os.environ.get("OMERO_PASS", password)
-    if password is None:
-        password = getpass('Enter password: ')
-
-    # set group
-    if group is None:
-        if config_dict:
-            group = config_dict.get("OMERO_GROUP", group)
-        group = os.environ.get("OMERO_GROUP", group)
-    if group is None:
-        group = input('Enter group name (or leave blank for default group): ')
-    if group == "":
-        group = None
-
-    # set host
-    if host is None:
-        if config_dict:
-            host = config_dict.get("OMERO_HOST", host)
-        host = os.environ.get("OMERO_HOST", host)
-    if host is None:
-        host = input('Enter host: ')
-
-    # set port
-    port_str = None
-    if port is None:
-        if config_dict:
-            port_str = config_dict.get("OMERO_PORT", str(port))
-        port_str = os.environ.get("OMERO_PORT", port_str)
-        if port_str:
-            port = int(port_str)
-    if port is None:
-        port = int(input('Enter port: '))
+    config = _read_config(config_fp)
+    config_dict = config['DEFAULT'] if config is not None else None
+
+    params = {'user': user, 'password': password, 'group': group,
+              'host': host, 'port': port}
+    for name, key, prompt, from_config, cast in _CONN_PARAMS:
+        prompt_fn = getpass if name == 'password' else input
+        value = _resolve_param(params[name], key,
+                               config_dict if from_config else None,
+                               prompt, prompt_fn)
+        if value == '' and cast is int:
+            # an empty number (e.g. OMERO_PORT="") counts as unset
+            value = _prompt(prompt, key, prompt_fn)
+        params[name] = cast(value) if cast is not None else value
 
     # set session security
-    secure_str = None
     if secure is None:
-        if config_dict:
-            secure_str = config_dict.get("OMERO_SECURE", str(secure))
-    secure_str = os.environ.get("OMERO_SECURE", secure_str)
-    if secure_str:
-        if secure_str.lower() in ["true", "t"]:
-            secure = True
-        elif secure_str.lower() in ["false", "f"]:
-            secure = False
+        secure = _str_to_bool(_resolve_param(None, "OMERO_SECURE",
+                                             config_dict))
     if secure is None:
-        str_secure: str = input('Secure session (True or False): ')
-        if str_secure.lower() in ["true", "t"]:
-            secure = True
-        elif str_secure.lower() in ["false", "f"]:
-            secure = False
-        else:
+        secure = _str_to_bool(_prompt('Secure session (True or False): ',
+                                      "OMERO_SECURE"))
+        if secure is None:
             raise ValueError('secure must be set to either True or False')
+    return _open_connection(params['user'], params['password'],
+                            params['group'], params['host'], params['port'],
+                            secure, pool=pool,
+                            keep_credentials=keep_credentials,
+                            attempts=attempts, backoff=backoff)
+
+
+class _PooledGateway(BlitzGateway):
+    """BlitzGateway that only closes once its last pool holder closes it."""
+
+    def close(self, hard=True):
+        if _release_pooled(self):
+            super().close(hard=hard)
+
+
+def _release_pooled(conn: BlitzGateway) -> bool:
+    """Drop one holder of a pooled connection.
+
+    Returns whether the connection should really be closed, i.e. whether no
+    other caller still holds it (or it is no longer pooled at all).
+    """
+    with _conn_pool_lock:
+        entry = _conn_pool.get(getattr(conn, '_ezomero_pool_key', None))
+        if entry is None or entry[0] is not conn:
+            return True
+        entry[1] -= 1
+        if entry[1] > 0:
+            return False
+        del _conn_pool[conn._ezomero_pool_key]
+        return True
+
+
+def _open_connection(user: str, password: str, group: Optional[str],
+                     host: str, port: int, secure: bool, pool: bool = False,
+                     keep_credentials: bool = False, attempts: int = 1,
+                     backoff: Sequence[float] = (0.1, 0.5, 2.0)
+                     ) -> Optional[BlitzGateway]:
+    """Return a live connection for fully resolved parameters.
+
+    With `pool`, hands back a pooled connection if one is still alive.
+    Otherwise logs in (up to `attempts` times, sleeping per `backoff` in
+    between), pooling the new connection if asked to.
+    """
+    if pool:
+        pw_hash = hashlib.sha256(str(password).encode()).hexdigest()
+        pool_key = (user, pw_hash, group, host, port, secure)
+        with _conn_pool_lock:
+            entry = _conn_pool.get(pool_key)
+            if entry is not None and entry[0].isConnected():
+                entry[1] += 1
+                conn = entry[0]
+            else:
+                _conn_pool.pop(pool_key, None)
+                conn = None
+        if conn is not None:
+            # another holder may have switched groups in the meantime
+            conn.SERVICE_OPTS.setOmeroGroup(conn._ezomero_group_id)
+            return conn
+        gateway = _PooledGateway
+    else:
+        gateway = BlitzGateway
+
     # create connection
-    conn = BlitzGateway(user, password, group=group, host=host, port=port,
-                        secure=secure)
-    if conn.connect():
+    conn = gateway(user, password, group=group, host=host, port=port,
+                   secure=secure)
+    connected = conn.connect()
+    for attempt in range(1, attempts):
+        if connected:
+            break
+        delay = backoff[min(attempt, len(backoff)) - 1] if backoff else 0
+        logging.warning(f'Could not connect, retrying in {delay} s '
+                        f'(attempt {attempt + 1} of {attempts})')
+        time.sleep(delay)
+        connected = conn.connect()
+    if connected:
+        # new session: memberships may have changed since we last checked
+        invalidate_group_cache(conn)
+        if pool:
+            conn._ezomero_pool_key = pool_key
+            conn._ezomero_group_id = conn.getEventContext().groupId
+            with _conn_pool_lock:
+                _conn_pool[pool_key] = [conn, 1]
+        credentials = (user, password) if keep_credentials else None
+        _conn_params[conn] = (group, host, port, secure, pool,
+                              conn.getEventContext().sessionUuid, credentials)
         return conn
     else:
         logging.error('Could not connect, check your settings')
         return None
 
 
+def reconnect(conn: BlitzGateway) -> Optional[BlitzGateway]:
+    """Reconnect using the parameters of an earlier ``ezomero.connect``.
+
+    Skips all parameter resolution (environment, '.ezomero' file, prompts)
+    and reuses the values that were resolved when `conn` was created. If
+    `conn` is still alive, it is returned as-is. Otherwise its session is
+    rejoined if it is still alive on the server, e.g. after a network
+    problem. Logging in again after the session has ended (for instance after
+    ``conn.close()``) needs ``ezomero.connect(..., keep_credentials=True)``.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        Connection previously returned by ``ezomero.connect``. It may have
+        been closed since.
+
+    Returns
+    -------
+    conn : ``omero.gateway.BlitzGateway`` object or None
+        OMERO connection, if successful. Otherwise an error is logged and
+        returns None.
+
+    Examples
+    --------
+    >>> conn = connect(keep_credentials=True)
+    >>> conn.close()
+    >>> conn = reconnect(conn)
+    """
+    params = _conn_params.get(conn)
+    if params is None:
+        raise ValueError('conn was not created by ezomero.connect')
+    if conn.isConnected():
+        return conn
+    group, host, port, secure, pool, session_uuid, credentials = params
+    new_conn = BlitzGateway(host=host, port=port, secure=secure)
+    if new_conn.connect(sUuid=session_uuid):
+        _conn_params[new_conn] = params
+        return new_conn
+    if credentials is None:
+        logging.error('Could not rejoin the session, and no credentials were '
+                      'kept to log in again (see connect(keep_credentials))')
+        return None
+    user, password = credentials
+    return _open_connection(user, password, group, host, port, secure,
+                            pool=pool, keep_credentials=True)
+
+
+def close_all() -> None:
+    """Close every connection created by ``ezomero.connect``.
+
+    Connections opened with ``ezomero.connect(pool=True)`` are handed out
+    again to later calls with the same parameters. This function closes all
+    of them, whoever still holds them, and empties the pool.
+
+    Returns
+    -------
+    Returns None.
+
+    Examples
+    --------
+    >>> conn = connect()
+    >>> ...
+    >>> close_all()
+    """
+    with _conn_pool_lock:
+        conns = [conn for conn, _ in _conn_pool.values()]
+        _conn_pool.clear()
+    for conn in conns:
+        conn.close(hard=True)
+    return None
+
+
 def store_connection_params(user: Optional[str] = None,
                             group: Optional[str] = None,
                             host: Optional[str] = None,
@@ -397,10 +728,16 @@ def store_connection_params(user: Optional[str] = None,
         Path to directory that will contain the '.ezomero' file. If left as
         ``None``, defaults to the home directory as determined by Python's
         ``pathlib``.
+
+    Notes
+    -----
+    Parameters that are not given are prompted for. If there is no terminal
+    to prompt on (e.g. in a batch job), a ``RuntimeError`` is raised instead
+    of waiting for input.
     """
     if config_path is None:
-        cpath = Path.home()
-    elif type(config_path) is str:
+        cpath = _default_config_path().parent
+    elif isinstance(config_path, str):
         cpath = Path(config_path)
     else:
         raise ValueError('config_path must be a string')
@@ -409,29 +746,28 @@ def store_connection_params(user: Optional[str] = None,
         raise ValueError('config_path must point to a valid directory')
     ezo_file = cpath / '.ezomero'
     if ezo_file.exists():
-        resp = input(f'{ezo_file} already exists. Overwrite? (Y/N)')
+        resp = _prompt(f'{ezo_file} already exists. Overwrite? (Y/N)',
+                       f'Overwrite confirmation for {ezo_file}')
         if resp.lower() not in ['yes', 'y']:
             return
 
     # get parameters
     if user is None:
-        user = input('Enter username: ')
+        user = _prompt('Enter username: ', 'OMERO_USER')
     if group is None:
-        group = input('Enter group name (or leave blank for default group): ')
+        group = _prompt('Enter group name (or leave blank for default '
+                        'group): ', 'OMERO_GROUP')
     if host is None:
-        host = input('Enter host: ')
+        host = _prompt('Enter host: ', 'OMERO_HOST')
     if port is None:
-        port = int(input('Enter port: '))
+        port = int(_prompt('Enter port: ', 'OMERO_PORT'))
     if secure is None:
-        secure_str = input('Secure session (True or False): ')
-        if secure_str.lower() in ["true", "t"]:
-            secure = True
-        elif secure_str.lower() in ["false", "f"]:
-            secure = False
-        else:
+        secure = _str_to_bool(_prompt('Secure session (True or False): ',
+                                      'OMERO_SECURE'))
+        if secure is None:
             raise ValueError('secure must be set to either True or False')
     if web_host is True:
-        web_host_str = input('Enter web host: ')
+        web_host_str = _prompt('Enter web host: ', 'OMERO_WEB_HOST')
     # make parameter dictionary and save as configfile
     # just use 'DEFAULT' for right now, we can possibly add alt configs later
     config = configparser.ConfigParser()
@@ -449,6 +785,33 @@ def store_connection_params(user: Optional[str] = None,
     with ezo_file.open('w') as configfile:
         config.write(configfile)
         print(f'Connection settings saved to {ezo_file}')
+    _config_cache.pop(ezo_file, None)
+
+
+def _is_group_member(conn: BlitzGateway, user_id: int,
+                     group_id: int) -> bool:
+    """Check whether a user is a member of a group, and remember the result.
+
+    Asks the admin service for the IDs of all groups the user belongs to,
+    which also fills the membership cache for every one of those groups.
+    Falls back to summarizing the group's owners and members if that call
+    is refused by the server.
+    """
+    try:
+        group_ids = conn.getAdminService().getMemberOfGroupIds(
+                        ExperimenterI(user_id, False))
+    except ServerError:
+        g = conn.getObject("ExperimenterGroup", group_id)
+        owners, members = g.groupSummary()
+        owner_ids = [e.getId() for e in owners]
+        member_ids = [e.getId() for e in members]
+        is_member = (user_id in owner_ids) or (user_id in member_ids)
+    else:
+        for gid in group_ids:
+            _group_membership[(conn.host, conn.port, user_id, gid)] = True
+        is_member = group_id in group_ids
+    _group_membership[(conn.host, conn.port, user_id, group_id)] = is_member
+    return is_member
 
 
 def set_group(conn: BlitzGateway, group_id: int) -> bool:
@@ -471,18 +834,46 @@ def set_group(conn: BlitzGateway, group_id: int) -> bool:
     -------
     change_status : bool
         Returns `True` if group is changed, otherwise returns `False`.
+
+    Notes
+    -----
+    Group membership is checked against the server only once per user and
+    group, and remembered afterwards. Use ``ezomero.invalidate_group_cache``
+    if memberships change during a session.
     """
-    if type(group_id) is not int:
+    if not _is_int(group_id):
         raise TypeError('Group ID must be an integer')
 
     user_id = conn.getUser().getId()
-    g = conn.getObject("ExperimenterGroup", group_id)
-    owners, members = g.groupSummary()
-    owner_ids = [e.getId() for e in owners]
-    member_ids = [e.getId() for e in members]
-    if (user_id in owner_ids) or (user_id in member_ids):
+    key = (conn.host, conn.port, user_id, group_id)
+    is_member = _group_membership.get(key)
+    if is_member is None:
+        is_member = _is_group_member(conn, user_id, group_id)
+    if is_member:
         conn.SERVICE_OPTS.setOmeroGroup(group_id)
         return True
     else:
         logging.warning(f'User {user_id} is not a member of Group {group_id}')
         return False
+
+
+def invalidate_group_cache(conn: Optional[BlitzGateway] = None) -> None:
+    """Forget group memberships remembered by ``ezomero.set_group``.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object, optional
+        Only forget memberships on the server of this connection. By default,
+        memberships on all servers are forgotten.
+
+    Returns
+    -------
+    Returns None.
+    """
+    if conn is None:
+        _group_membership.clear()
+        return None
+    server = (conn.host, conn.port)
+    for key in [key for key in _group_membership if key[:2] == server]:
+        _group_membership.pop(key, None)
+    return None
@@ -1,16 +1,25 @@
+import functools
 import logging
+import numbers
 import os
+import queue
+import threading
+import time
+import weakref
 import numpy as np
-from typing import Optional, List, Union, Tuple, Literal
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Union, Tuple, Literal, Callable, Dict
+from typing import BinaryIO, Iterable, Iterator
 from typing import Any
 from ._ezomero import do_across_groups
-from omero.gateway import FileAnnotationWrapper, BlitzGateway, ImageWrapper
+from omero.gateway import BlitzGateway, ImageWrapper
 from omero import ApiUsageException, InternalException
-from omero.model import MapAnnotationI, TagAnnotationI, Shape
-from omero.model import CommentAnnotationI
+from omero.model import OriginalFileI, Shape
 from omero.grid import Table
-from omero.rtypes import rint, rlong
-from omero.sys import Parameters
+from omero.rtypes import rint, rlist, rlong, rstring, unwrap
+from omero.sys import Filter, Parameters
 from omero.model import enums as omero_enums
 from .rois import Point, Line, Rectangle
 from .rois import Ellipse, Polygon, Polyline, Label, ezShape
@@ -23,6 +32,289 @@ else:
     has_pandas = False
 
 
+# maximum number of threads used to fetch planes/tiles in `get_image`
+MAX_PLANE_WORKERS = 8
+# maximum number of fetched planes/tiles waiting to be placed in `get_image`
+MAX_QUEUED_PLANES = 4
+# maximum number of downloaded chunks waiting to be written to disk in
+# `get_file_annotation`
+MAX_QUEUED_CHUNKS = 4
+# number of IDs fetched per query by the `iter_*_ids` generators
+ID_PAGE_SIZE = 10000
+# number of rows read per call when getting an OMERO table
+TABLE_CHUNK_ROWS = 65536
+
+# resolution levels of pyramidal images, per connection and Pixels ID,
+# keeping the most recently used `_RESOLUTION_CACHE_SIZE` entries
+_RESOLUTION_CACHE_SIZE = 128
+_resolution_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_resolution_cache_lock = threading.Lock()
+
+
+def _resolution_levels(conn: BlitzGateway, pixels_id: int,
+                       pix: Any = None) -> List[Tuple[int, int]]:
+    """Return (sizeX, sizeY) of each resolution level, largest first.
+
+    Results are cached per connection, so repeated reads of the same image
+    skip the round-trip. `pix` is an optional ``RawPixelsStore`` already
+    set to `pixels_id`; without one, a store is only opened on cache miss.
+    """
+    with _resolution_cache_lock:
+        levels = _resolution_cache.setdefault(conn, OrderedDict())
+        if pixels_id in levels:
+            levels.move_to_end(pixels_id)
+            return levels[pixels_id]
+    if pix is None:
+        store = conn.c.sf.createRawPixelsStore()
+        try:
+            store.setPixelsId(pixels_id, False)
+            res = [(r.sizeX, r.sizeY)
+                   for r in store.getResolutionDescriptions()]
+        finally:
+            store.close()
+    else:
+        res = [(r.sizeX, r.sizeY) for r in pix.getResolutionDescriptions()]
+    with _resolution_cache_lock:
+        levels[pixels_id] = res
+        if len(levels) > _RESOLUTION_CACHE_SIZE:
+            levels.popitem(last=False)
+    return res
+
+
+# group/user IDs looked up by name, per connection, kept for
+# `_NAME_ID_TTL` seconds
+_NAME_ID_TTL = 60.0
+_name_id_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_name_id_cache_lock = threading.Lock()
+
+
+def _lookup_id(conn: BlitzGateway, kind: str, name: str,
+               lookup: Callable[[str], Any]) -> Optional[int]:
+    """Return the ID of the `kind` object called `name`, or None.
+
+    `lookup` is the admin service method finding it by name. Found IDs are
+    cached for `_NAME_ID_TTL` seconds; misses are not, so a group or user
+    created in the meantime is picked up by the next call.
+    """
+    key = (kind, name)
+    now = time.monotonic()
+    with _name_id_cache_lock:
+        ids = _name_id_cache.setdefault(conn, {})
+        hit = ids.get(key)
+        if hit is not None and hit[1] > now:
+            return hit[0]
+    try:
+        obj_id = lookup(name).id.val
+    except ApiUsageException:
+        return None
+    with _name_id_cache_lock:
+        ids[key] = (obj_id, now + _NAME_ID_TTL)
+    return obj_id
+
+
+def _require_int(value: Any, message: str) -> int:
+    """Return `value` as an ``int``, or raise ``TypeError(message)``.
+
+    numpy integers, e.g. IDs taken from a pandas DataFrame, are accepted;
+    ``bool`` is not.
+    """
+    if isinstance(value, bool) or not isinstance(value, numbers.Integral):
+        raise TypeError(message)
+    return int(value)
+
+
+def _require_xyzct(value: Any, name: str) -> None:
+    """Check that `value` is a list or tuple with one entry per axis."""
+    if not isinstance(value, (list, tuple)):
+        raise TypeError(f'{name} must be supplied as list or tuple')
+    if len(value) != 5:
+        raise ValueError(f'{name} must have length 5 (XYZCT)')
+
+
+def _zct_range(start_coords: Union[List[int], Tuple[int, ...]],
+               axis_lengths: Union[List[int], Tuple[int, ...]]
+               ) -> np.ndarray:
+    """List every (z, c, t) of a region, in Z-major, then C, then T order.
+
+    `start_coords` and `axis_lengths` are in XYZCT order. Returns an
+    ``(n_planes, 3)`` integer array, which is far smaller than a list of
+    tuples for long time series or deep stacks.
+    """
+    z, c, t = np.meshgrid(
+        np.arange(start_coords[2], start_coords[2] + axis_lengths[2]),
+        np.arange(start_coords[3], start_coords[3] + axis_lengths[3]),
+        np.arange(start_coords[4], start_coords[4] + axis_lengths[4]),
+        indexing='ij')
+    return np.stack([z.ravel(), c.ravel(), t.ravel()],
+                    axis=1).astype(np.int32)
+
+
+def _order_vector(dim_order: Optional[str],
+                  xyzct: Optional[bool]) -> Optional[List[int]]:
+    """Positions of the T, Z, Y, X and C axes in the array to be returned.
+
+    Returns None if the array should be returned as TZYXC.
+    """
+    if dim_order is not None:
+        order_dict = dict(zip(dim_order.lower(), range(5)))
+        order_vector = [order_dict[c] for c in 'tzyxc']
+        # native layout: hand back the buffer itself rather than a view
+        if order_vector == [0, 1, 2, 3, 4]:
+            return None
+        return order_vector
+    if xyzct is True:
+        return [4, 2, 1, 0, 3]
+    return None
+
+
+def _allocate_pixels(tzyxc_shape: List[int], dtype: Any, zero_fill: bool,
+                     order_vector: Optional[List[int]],
+                     contiguous: Optional[bool],
+                     out: Optional[np.ndarray] = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+    """Allocate the pixel array returned by `get_image`.
+
+    Returns a pair of arrays sharing the same memory: ``pixels``, always
+    indexed TZYXC, into which planes are written, and ``pixel_view``, with
+    its axes arranged according to `order_vector`, which is returned to the
+    user. With `contiguous`, the memory is laid out in the returned order
+    and ``pixels`` is the (non-contiguous) view instead. If `out` is given,
+    it is used as ``pixel_view`` instead of allocating anything.
+    """
+    tzyxc_axes = [0, 1, 2, 3, 4]
+    if order_vector is None:
+        shape = list(tzyxc_shape)
+    else:
+        shape = [0] * 5
+        for src, dst in enumerate(order_vector):
+            shape[dst] = tzyxc_shape[src]
+    if out is not None:
+        if out.shape != tuple(shape):
+            raise ValueError(f'out has shape {out.shape}, '
+                             f'expected {tuple(shape)}')
+        if out.dtype != np.dtype(dtype):
+            raise ValueError(f'out has dtype {out.dtype}, '
+                             f'expected {np.dtype(dtype)}')
+        if not out.flags.writeable:
+            raise ValueError('out must be writeable')
+        if zero_fill:
+            out.fill(0)
+        if order_vector is None:
+            return out, out
+        return np.moveaxis(out, order_vector, tzyxc_axes), out
+    alloc = np.zeros if zero_fill else np.empty
+    if order_vector is None:
+        pixels = alloc(tzyxc_shape, dtype=dtype)
+        return pixels, pixels
+    if contiguous:
+        pixel_view = alloc(shape, dtype=dtype)
+        pixels = np.moveaxis(pixel_view, order_vector, tzyxc_axes)
+    else:
+        pixels = alloc(tzyxc_shape, dtype=dtype)
+        pixel_view = np.moveaxis(pixels, tzyxc_axes, order_vector)
+    return pixels, pixel_view
+
+
+def _plane_placer(pixels: np.ndarray, zct_list: np.ndarray,
+                  start_coords: Union[List[int], Tuple[int, ...]],
+                  axis_lengths: Union[List[int], Tuple[int, ...]]
+                  ) -> Callable:
+    """Return a function writing the i-th plane of `zct_list` into `pixels`.
+
+    `pixels` is indexed TZYXC; `start_coords` and `axis_lengths` (already
+    trimmed to the image) are in XYZCT order. Destination indices of every
+    plane are worked out up front. When planes cover the whole YX extent of
+    `pixels`, i.e. nothing is padded in X or Y, they are written without
+    slicing YX. Each plane is written straight into `pixels`, with no
+    intermediate copy.
+    """
+    offsets = (zct_list.astype(np.intp)
+               - np.asarray(start_coords[2:5], dtype=np.intp))
+    # plain ints index numpy arrays faster than numpy scalars
+    tzc = offsets[:, [2, 0, 1]].tolist()
+    size_y, size_x = axis_lengths[1], axis_lengths[0]
+    if pixels.shape[2:4] == (size_y, size_x):
+        def place(i, plane):
+            t, z, c = tzc[i]
+            pixels[t, z, :, :, c] = plane
+    else:
+        def place(i, plane):
+            t, z, c = tzc[i]
+            pixels[t, z, :size_y, :size_x, c] = plane
+    return place
+
+
+def _fetch_planes(fetch: Callable, zct_list: np.ndarray,
+                  place: Callable,
+                  max_workers: int = MAX_PLANE_WORKERS) -> None:
+    """Fetch planes concurrently and hand each one to `place`.
+
+    `zct_list` is split into one contiguous chunk per worker thread, so each
+    worker can stream its chunk through a single pixels store. Fetching is
+    dominated by server round-trips, so threads overlap that latency.
+    Workers pass planes to the calling thread through a bounded queue, so
+    placing planes overlaps with fetching the next ones while at most
+    `MAX_QUEUED_PLANES` planes wait in memory.
+
+    Parameters
+    ----------
+    fetch : callable
+        Called with a list of (z, c, t) tuples of Python ints, returns an
+        iterable with one plane per coordinate, in the same order.
+    zct_list : numpy array
+        ZCT coordinates of all planes to fetch, one row per plane, as
+        returned by `_zct_range`.
+    place : callable
+        Called from the calling thread with the index in `zct_list` and the
+        plane for every fetched plane, in no particular order.
+    max_workers : int, optional
+        Maximum number of threads to use.
+    """
+    if len(zct_list) == 0:
+        return
+    n_workers = max(1, min(max_workers, len(zct_list)))
+    chunk_size = -(-len(zct_list) // n_workers)
+    starts = range(0, len(zct_list), chunk_size)
+    planes: queue.Queue = queue.Queue(maxsize=MAX_QUEUED_PLANES)
+    failed = threading.Event()
+    done = object()
+
+    def work(start):
+        # the server wants plain ints, not numpy scalars
+        chunk = list(map(tuple, zct_list[start:start + chunk_size].tolist()))
+        try:
+            for i, plane in enumerate(fetch(chunk), start):
+                if failed.is_set():
+                    break
+                planes.put((i, plane))
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            planes.put(done)
+
+    error = None
+    with ThreadPoolExecutor(max_workers=len(starts)) as executor:
+        futures = [executor.submit(work, start) for start in starts]
+        running = len(futures)
+        # keep draining after a failure so that no worker blocks on put()
+        while running:
+            item = planes.get()
+            if item is done:
+                running -= 1
+            elif error is None:
+                try:
+                    place(*item)
+                except BaseException as e:
+                    error = e
+                    failed.set()
+    if error is not None:
+        raise error
+    for future in futures:
+        # re-raise any exception from the workers
+        future.result()
+
+
 # gets
 @do_across_groups
 def get_image(conn: BlitzGateway, image_id: int,
@@ -33,6 +325,8 @@ def get_image(conn: BlitzGateway, image_id: int,
               pad: Optional[bool] = False,
               pyramid_level: Optional[int] = None,
               dim_order: Optional[str] = None,
+              contiguous: Optional[bool] = False,
+              out: Optional[np.ndarray] = None,
               across_groups: Optional[bool] = True
               ) -> Tuple[Union[ImageWrapper, None], Union[np.ndarray, None]]:
     """Get omero image object along with pixels as a numpy array.
@@ -70,6 +364,17 @@ def get_image(conn: BlitzGateway, image_id: int,
         String containing the letters 'x', 'y', 'z', 'c' and 't' in some order,
         specifying the order of dimensions to be returned by the function.
         If specified, ignores the value of the 'xyzct' variable.
+    contiguous : bool, optional
+        If `True` and `xyzct` or `dim_order` is set, the returned array is
+        allocated directly in the requested dimension order, so it is
+        C-contiguous instead of being a view of a TZYXC array. Default is
+        False.
+    out : ndarray, optional
+        Existing array to write the pixels into instead of allocating a new
+        one, e.g. to reuse one buffer across many calls. It must have exactly
+        the shape and dtype of the array that would be returned (in the
+        requested dimension order), and is returned as `pixels`. Ignored if
+        `no_pixels` is True.
     across_groups : bool, optional
         Defines cross-group behavior of function - set to
         ``False`` to disable it.
@@ -84,10 +389,15 @@ def get_image(conn: BlitzGateway, image_id: int,
 
     Notes
     -----
-    Regardless of whether `xyzct` is `True` or `dim_order` is set, the numpy
-    array is created as TZYXC, for performance reasons. If `xyzct` is `True`
-    or `dim_order` is set, the returned `pixels` array is actually a view
-    of the original TZYXC array.
+    Unless `contiguous` is `True`, the numpy array is created as TZYXC
+    regardless of whether `xyzct` is `True` or `dim_order` is set, for
+    performance reasons. If `xyzct` is `True` or `dim_order` is set, the
+    returned `pixels` array is then actually a view of the original TZYXC
+    array. Such views are not C-contiguous, which makes some downstream
+    operations slower; pass ``contiguous=True`` to avoid that.
+
+    When `out` is given, its own memory layout is used as is and
+    `contiguous` has no effect.
 
     Examples
     --------
@@ -108,25 +418,20 @@ def get_image(conn: BlitzGateway, image_id: int,
     """
 
     if start_coords is not None:
-        if type(start_coords) not in (list, tuple):
-            raise TypeError('start_coords must be supplied as list or tuple')
-        if len(start_coords) != 5:
-            raise ValueError('start_coords must have length 5 (XYZCT)')
-
+        _require_xyzct(start_coords, 'start_coords')
     if axis_lengths is not None:
-        if type(axis_lengths) not in (list, tuple):
-            raise TypeError('axis_lengths must be supplied as list of tuple')
-        if len(axis_lengths) != 5:
-            raise ValueError('axis_lengths must have length 5 (XYZCT)')
+        _require_xyzct(axis_lengths, 'axis_lengths')
 
     if image_id is None:
         raise TypeError('Object ID cannot be empty')
-    if type(image_id) is not int:
-        raise TypeError('Image ID must be an integer')
+    image_id = _require_int(image_id, 'Image ID must be an integer')
 
     if pyramid_level is not None:
-        if type(pyramid_level) is not int:
-            raise TypeError('pyramid_level must be an int')
+        pyramid_level = _require_int(
+            pyramid_level, 'pyramid_level must be an int')
+
+    if out is not None and not isinstance(out, np.ndarray):
+        raise TypeError('out must be a numpy array')
 
     if dim_order is not None:
         if type(dim_order) is not str:
@@ -141,12 +446,15 @@ def get_image(conn: BlitzGateway, image_id: int,
         logging.warning(f'Cannot load image {image_id} - '
                         'check if you have permissions to do so')
         return (None, None)
-    size_x = image.getSizeX()
-    size_y = image.getSizeY()
-    size_z = image.getSizeZ()
-    size_c = image.getSizeC()
-    size_t = image.getSizeT()
-    pixels_dtype = image.getPixelsType()
+    # the Pixels object comes with the image, so read all its metadata off
+    # one wrapper rather than going through an ImageWrapper accessor each
+    primary_pixels = image.getPrimaryPixels()
+    size_x = primary_pixels.getSizeX()
+    size_y = primary_pixels.getSizeY()
+    size_z = primary_pixels.getSizeZ()
+    size_c = primary_pixels.getSizeC()
+    size_t = primary_pixels.getSizeT()
+    pixels_dtype = primary_pixels.getPixelsType().value
     orig_sizes = [size_x, size_y, size_z, size_c, size_t]
 
     if no_pixels is False:
@@ -164,13 +472,11 @@ def get_image(conn: BlitzGateway, image_id: int,
                                 orig_sizes[3] - start_coords[3],  # C
                                 orig_sizes[4] - start_coords[4])  # T
 
-            primary_pixels = image.getPrimaryPixels()
             reordered_sizes = [axis_lengths[4],
                                axis_lengths[2],
                                axis_lengths[1],
                                axis_lengths[0],
                                axis_lengths[3]]
-            pixels = np.zeros(reordered_sizes, dtype=pixels_dtype)
 
             # get pixels
 
@@ -180,52 +486,34 @@ def get_image(conn: BlitzGateway, image_id: int,
                          in zip(axis_lengths,
                                 start_coords,
                                 orig_sizes)]
-            overhangs = [np.max((0, o)) for o in overhangs]
-            if any([x > 0 for x in overhangs]) & (pad is False):
+            overhangs = [max(0, o) for o in overhangs]
+            if any(x > 0 for x in overhangs) and pad is False:
                 raise IndexError('Attempting to access out-of-bounds pixel. '
                                  'Either adjust axis_lengths or use pad=True')
 
             axis_lengths = [al - oh for al, oh in zip(axis_lengths, overhangs)]
-            zct_tuples: List[Tuple[int, ...]] = []
-            for z in range(start_coords[2],
-                           start_coords[2] + axis_lengths[2]):
-                for c in range(start_coords[3],
-                               start_coords[3] + axis_lengths[3]):
-                    for t in range(start_coords[4],
-                                   start_coords[4] + axis_lengths[4]):
-                        zct_tuples.append((z, c, t))
-            zct_list = [list(zct) for zct in zct_tuples]
+            # every element gets overwritten unless we are padding, so only
+            # pay for zero-filling when needed
+            pixels, pixel_view = _allocate_pixels(
+                reordered_sizes, pixels_dtype,
+                any(x > 0 for x in overhangs),
+                _order_vector(dim_order, xyzct), contiguous, out)
+            zct_list = _zct_range(start_coords, axis_lengths)
 
             if reordered_sizes == [size_t, size_z, size_y, size_x, size_c]:
-                plane_gen = primary_pixels.getPlanes(zct_tuples)
+                def fetch(chunk):
+                    return primary_pixels.getPlanes(chunk)
             else:
                 tile = (start_coords[0], start_coords[1],
                         axis_lengths[0], axis_lengths[1])
-                zct_tiles: List[Tuple[int, int, int, Tuple[int, ...]]] = []
-                for zct in zct_list:
-                    zct_tiles.append((zct[0], zct[1], zct[2], tile))
-                plane_gen = primary_pixels.getTiles(zct_tiles)
-
-            for i, plane in enumerate(plane_gen):
-                zct_coords = zct_list[i]
-                z = zct_coords[0] - start_coords[2]
-                c = zct_coords[1] - start_coords[3]
-                t = zct_coords[2] - start_coords[4]
-                pixels[t, z, :axis_lengths[1], :axis_lengths[0], c] = plane
-
-            if dim_order is not None:
-                order_dict = dict(zip(dim_order, range(5)))
-                order_vector = [order_dict[c.lower()] for c in 'tzyxc']
-                pixel_view = np.moveaxis(pixels,
-                                         [0, 1, 2, 3, 4],
-                                         order_vector)
-            else:
-                if xyzct is True:
-                    pixel_view = np.moveaxis(pixels,
-                                             [0, 1, 2, 3, 4],
-                                             [4, 2, 1, 0, 3])
-                else:
-                    pixel_view = pixels
+
+                def fetch(chunk):
+                    zct_tiles = [(z, c, t, tile) for z, c, t in chunk]
+                    return primary_pixels.getTiles(zct_tiles)
+
+            _fetch_planes(fetch, zct_list,
+                          _plane_placer(pixels, zct_list, start_coords,
+                                        axis_lengths))
 
         else:
             # get specific pyramid level
@@ -239,12 +527,8 @@ def get_image(conn: BlitzGateway, image_id: int,
                             omero_enums.PixelsTypefloat: np.float32,
                             omero_enums.PixelsTypedouble: np.float64,
                           }
-            pix = image._conn.c.sf.createRawPixelsStore()
-            pid = image.getPixelsId()
-            pix.setPixelsId(pid, False)
-            res_levels = [(r.sizeX, r.sizeY)
-                          for r in pix.getResolutionDescriptions()]
-            pix.setResolutionLevel((len(res_levels) - pyramid_level - 1))
+            pid = primary_pixels.getId()
+            res_levels = _resolution_levels(image._conn, pid)
             size_w, size_h = res_levels[pyramid_level]
             orig_sizes = [size_w, size_h, size_z, size_c, size_t]
             if start_coords is None:
@@ -256,77 +540,410 @@ def get_image(conn: BlitzGateway, image_id: int,
                                 orig_sizes[2] - start_coords[2],  # Z
                                 orig_sizes[3] - start_coords[3],  # C
                                 orig_sizes[4] - start_coords[4])  # T
-            primary_pixels = image.getPrimaryPixels()
             reordered_sizes = [axis_lengths[4],
                                axis_lengths[2],
                                axis_lengths[1],
                                axis_lengths[0],
                                axis_lengths[3]]
-            pixels = np.zeros(reordered_sizes, dtype=pixels_dtype)
     # check here if you need to trim the axis_lengths, trim if necessary
             overhangs = [(al + sc) - osz
                          for al, sc, osz
                          in zip(axis_lengths,
                                 start_coords,
                                 orig_sizes)]
-            overhangs = [np.max((0, o)) for o in overhangs]
-            if any([x > 0 for x in overhangs]) & (pad is False):
+            overhangs = [max(0, o) for o in overhangs]
+            if any(x > 0 for x in overhangs) and pad is False:
                 raise IndexError('Attempting to access out-of-bounds pixel. '
                                  'Either adjust axis_lengths or use pad=True')
             axis_lengths = [al - oh for al, oh in zip(axis_lengths, overhangs)]
+            # every element gets overwritten unless we are padding, so only
+            # pay for zero-filling when needed
+            pixels, pixel_view = _allocate_pixels(
+                reordered_sizes, pixels_dtype,
+                any(x > 0 for x in overhangs),
+                _order_vector(dim_order, xyzct), contiguous, out)
             # get pixels
-            zct_list = []
-            for z in range(start_coords[2],
-                           start_coords[2] + axis_lengths[2]):
-                for c in range(start_coords[3],
-                               start_coords[3] + axis_lengths[3]):
-                    for t in range(start_coords[4],
-                                   start_coords[4] + axis_lengths[4]):
-                        zct_list.append([z, c, t])
-
-            dtype = PIXEL_TYPES.get(primary_pixels.getPixelsType().value, None)
+            zct_list = _zct_range(start_coords, axis_lengths)
+
+            dtype = PIXEL_TYPES.get(pixels_dtype, None)
             if reordered_sizes == [size_t, size_z, size_h, size_w, size_c]:
                 # getting whole plane
-                plane_gen = []
-                for zct in zct_list:
-                    byte_plane = pix.getPlane(*zct)
-                    plane = np.frombuffer(byte_plane, dtype=dtype)
-                    plane = plane.reshape((size_h, size_w))
-                    plane_gen.append(plane)
+                plane_shape = (size_h, size_w)
 
+                def read(store, zct):
+                    return store.getPlane(*zct)
             else:
-                plane_gen = []
                 tile = (start_coords[0], start_coords[1],
                         axis_lengths[0], axis_lengths[1])
-                for zct in zct_list:
-                    this_tile = pix.getTile(*zct, *tile)
-                    this_tile = np.frombuffer(this_tile, dtype=dtype)
-                    this_tile = this_tile.reshape((tile[3], tile[2]))
-                    plane_gen.append(this_tile)
-
-            for i, plane in enumerate(plane_gen):
-                zct_coords = zct_list[i]
-                z = zct_coords[0] - start_coords[2]
-                c = zct_coords[1] - start_coords[3]
-                t = zct_coords[2] - start_coords[4]
-                pixels[t, z, :axis_lengths[1], :axis_lengths[0], c] = plane
-            if dim_order is not None:
-                order_dict = dict(zip(dim_order, range(5)))
-                order_vector = [order_dict[c.lower()] for c in 'tzyxc']
-                pixel_view = np.moveaxis(pixels,
-                                         [0, 1, 2, 3, 4],
-                                         order_vector)
-            else:
-                if xyzct is True:
-                    pixel_view = np.moveaxis(pixels,
-                                             [0, 1, 2, 3, 4],
-                                             [4, 2, 1, 0, 3])
-                else:
-                    pixel_view = pixels
-            pix.close()
+                plane_shape = (tile[3], tile[2])
+
+                def read(store, zct):
+                    return store.getTile(*zct, *tile)
+
+            def fetch(chunk):
+                # raw pixels stores are stateful and not safe to share
+                # between threads, so every worker opens its own
+                store = image._conn.c.sf.createRawPixelsStore()
+                try:
+                    store.setPixelsId(pid, False)
+                    store.setResolutionLevel(len(res_levels)
+                                             - pyramid_level - 1)
+                    for zct in chunk:
+                        plane = np.frombuffer(read(store, zct), dtype=dtype)
+                        yield plane.reshape(plane_shape)
+                finally:
+                    store.close()
+
+            # planes are placed as they arrive, so each worker holds at most
+            # one raw buffer at a time
+            _fetch_planes(fetch, zct_list,
+                          _plane_placer(pixels, zct_list, start_coords,
+                                        axis_lengths))
     return (image, pixel_view)
 
 
+# HQL of the single-query getters, by name, for use with `_project`
+_HQL = {
+    'well_id': ("SELECT w.id FROM Plate pl"
+                " JOIN pl.wells w"
+                " WHERE pl.id=:plate"
+                " AND w.row=:row"
+                " AND w.column=:column"
+                " ORDER BY w.id"),
+    'shape_ids': ("SELECT s.id FROM Shape s"
+                  " WHERE s.roi.id=:roi_id"
+                  " ORDER BY s.id"),
+    'roi_shape_ids': ("SELECT r.id, s.id FROM Roi r"
+                      " LEFT JOIN r.shapes s"
+                      " WHERE r.image.id=:imid"
+                      " ORDER BY r.id, s.id"),
+    'map_values': ("SELECT m.id, mv.name, mv.value FROM MapAnnotation m"
+                   " JOIN m.mapValue mv"
+                   " WHERE m.id IN (:ids)"
+                   " ORDER BY m.id, index(mv)"),
+    'client_paths': ("SELECT fe.clientPath"
+                     " FROM Image i"
+                     " JOIN i.fileset f"
+                     " JOIN f.usedFiles fe"
+                     " WHERE i.id=:imid"),
+    'repo_paths': ("SELECT o.path, o.name"
+                   " FROM Image i"
+                   " JOIN i.fileset f"
+                   " JOIN f.usedFiles fe"
+                   " JOIN fe.originalFile o"
+                   " WHERE i.id=:imid"),
+    'series_index': ("SELECT i.series"
+                     " FROM Image i"
+                     " JOIN i.fileset f"
+                     " JOIN f.usedFiles fe"
+                     " WHERE i.id=:imid AND index(fe)=0"),
+    'tag_value': ("SELECT a.textValue FROM TagAnnotation a"
+                  " WHERE a.id=:id"),
+    'comment_value': ("SELECT a.textValue FROM CommentAnnotation a"
+                      " WHERE a.id=:id"),
+    'ann_file_id': ("SELECT a.file.id FROM FileAnnotation a"
+                    " WHERE a.id=:id"),
+    'pixels_id': ("SELECT p.id FROM Image i"
+                  " JOIN i.pixels p"
+                  " WHERE i.id=:imid"),
+}
+
+
+def _parameters(params: Dict[str, Any], limit: Optional[int] = None,
+                offset: int = 0) -> Parameters:
+    """Query parameters, returning at most `limit` rows from `offset` on."""
+    parameters = Parameters()
+    parameters.map = params
+    if limit is not None:
+        parameters.theFilter = Filter()
+        parameters.theFilter.offset = rint(offset)
+        parameters.theFilter.limit = rint(limit)
+    return parameters
+
+
+def _project(conn: BlitzGateway, key: str, limit: Optional[int] = None,
+             **params: Any) -> List[List[Any]]:
+    """Run the `_HQL` projection `key` with the given (rtype) parameters.
+
+    If `limit` is set, the server returns at most that many rows.
+    """
+    parameters = _parameters(params, limit)
+    # no need to keep the service around between calls: the gateway already
+    # holds one proxy per service and only replaces them when it reconnects
+    return conn.getQueryService().projection(_HQL[key], parameters,
+                                             conn.SERVICE_OPTS)
+
+
+# HQL pieces for the IDs of objects of a given kind (outer key) inside a
+# given kind of container (inner key), as (object ID column, container ID
+# column, FROM clause, whether rows must be made distinct). The `None` entry,
+# if any, is a full query used when no container is given (orphans, or all
+# objects for top-level kinds).
+_ID_QUERIES: Dict[str, Dict[Optional[str], Any]] = {
+    'image': {
+        'project': ("i.id", "p.id",
+                    "FROM Project p"
+                    " JOIN p.datasetLinks pdl"
+                    " JOIN pdl.child d"
+                    " JOIN d.imageLinks dil"
+                    " JOIN dil.child i", False),
+        'dataset': ("i.id", "d.id",
+                    "FROM Dataset d"
+                    " JOIN d.imageLinks dil"
+                    " JOIN dil.child i", False),
+        'plate': ("i.id", "pl.id",
+                  "FROM Plate pl"
+                  " JOIN pl.wells w"
+                  " JOIN w.wellSamples ws"
+                  " JOIN ws.image i", False),
+        'well': ("i.id", "w.id",
+                 "FROM Well w"
+                 " JOIN w.wellSamples ws"
+                 " JOIN ws.image i", False),
+        'plate_acquisition': ("i.id", "pa.id",
+                              "FROM WellSample ws"
+                              " JOIN ws.image i"
+                              " JOIN ws.plateAcquisition pa", False),
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM ImageAnnotationLink l", False),
+        None: ("SELECT i.id FROM Image i"
+               " WHERE NOT EXISTS ("
+               " SELECT dil FROM DatasetImageLink dil"
+               " WHERE dil.child=i.id"
+               " )"
+               " AND NOT EXISTS ("
+               " SELECT ws from WellSample ws"
+               " WHERE ws.image=i.id"
+               " )"),
+    },
+    'project': {
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM ProjectAnnotationLink l", False),
+        None: "SELECT p.id FROM Project p",
+    },
+    'dataset': {
+        'project': ("d.id", "p.id",
+                    "FROM Project p"
+                    " JOIN p.datasetLinks pdl"
+                    " JOIN pdl.child d", False),
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM DatasetAnnotationLink l", False),
+        None: ("SELECT d.id FROM Dataset d"
+               " WHERE NOT EXISTS ("
+               " SELECT pdl FROM ProjectDatasetLink pdl"
+               " WHERE pdl.child=d.id"
+               " )"),
+    },
+    'screen': {
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM ScreenAnnotationLink l", False),
+        None: "SELECT s.id FROM Screen s",
+    },
+    'plate': {
+        'screen': ("p.id", "s.id",
+                   "FROM Screen s"
+                   " JOIN s.plateLinks spl"
+                   " JOIN spl.child p", False),
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM PlateAnnotationLink l", False),
+        None: ("SELECT p.id FROM Plate p"
+               " WHERE NOT EXISTS ("
+               " SELECT spl FROM ScreenPlateLink spl"
+               " WHERE spl.child=p.id"
+               " )"),
+    },
+    'well': {
+        'screen': ("w.id", "s.id",
+                   "FROM Screen s"
+                   " JOIN s.plateLinks spl"
+                   " JOIN spl.child p"
+                   " JOIN p.wells w", True),
+        'plate': ("w.id", "p.id",
+                  "FROM Plate p"
+                  " JOIN p.wells w", True),
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM WellAnnotationLink l", True),
+    },
+    'plate_acquisition': {
+        'screen': ("r.id", "s.id",
+                   "FROM Screen s"
+                   " JOIN s.plateLinks spl"
+                   " JOIN spl.child p"
+                   " JOIN p.plateAcquisitions r", True),
+        'plate': ("r.id", "p.id",
+                  "FROM Plate p"
+                  " JOIN p.plateAcquisitions r", True),
+        'annotation': ("l.parent.id", "l.child.id",
+                       "FROM PlateAcquisitionAnnotationLink l", True),
+    },
+}
+
+
+def _select(distinct: bool) -> str:
+    """SELECT keyword of an `_ID_QUERIES` entry."""
+    return "SELECT DISTINCT" if distinct else "SELECT"
+
+
+def _batch_id_query(obj_col: str, container_col: str, from_clause: str,
+                    distinct: bool) -> str:
+    """HQL returning (container ID, object ID) rows for a list of containers.
+
+    With `distinct`, an object reached through several links (e.g. a plate
+    linked to the same screen by two users) is only returned once.
+    """
+    return (f"{_select(distinct)} {container_col}, {obj_col} {from_clause}"
+            f" WHERE {container_col} IN (:ids)")
+
+
+# full queries built from `_ID_QUERIES` once at import, so every call sends
+# the exact same string and nothing is formatted per call
+_BATCH_ID_QUERIES: Dict[str, Dict[str, str]] = {
+    kind: {container: _batch_id_query(*parts)
+           for container, parts in queries.items()
+           if container is not None}
+    for kind, queries in _ID_QUERIES.items()
+}
+
+# how container kinds are named in error messages
+_CONTAINER_NAMES = {'project': 'Project',
+                    'dataset': 'Dataset',
+                    'screen': 'Screen',
+                    'plate': 'Plate',
+                    'well': 'Well',
+                    'plate_acquisition': 'Plate acquisition',
+                    'annotation': 'Annotation'}
+
+
+def _first_values(results: List[List[Any]]) -> List[Any]:
+    """Unwrap the first column of HQL projection results."""
+    # itemgetter/attrgetter keep the per-row work in C
+    return list(map(attrgetter('val'), map(itemgetter(0), results)))
+
+
+def _projection_ids(conn: BlitzGateway, hql: str) -> List[int]:
+    """Run an HQL projection whose first column is an ID."""
+    q = conn.getQueryService()
+    results = q.projection(hql, Parameters(), conn.SERVICE_OPTS)
+    return _first_values(results)
+
+
+def _container_ids(conn: BlitzGateway, kind: str, container: str,
+                   container_ids: List[int]) -> Dict[int, List[int]]:
+    """Map each of `container_ids` to the IDs of `kind` objects inside it.
+
+    All containers are looked up with a single query.
+    """
+    ids_by_container: Dict[int, List[int]] = {c: [] for c in container_ids}
+    if not container_ids:
+        return ids_by_container
+    q = conn.getQueryService()
+    params = Parameters()
+    params.map = {"ids": rlist([rlong(c) for c in ids_by_container])}
+    results = q.projection(
+        _BATCH_ID_QUERIES[kind][container],
+        params,
+        conn.SERVICE_OPTS
+        )
+    for r in results:
+        ids_by_container[r[0].val].append(r[1].val)
+    return ids_by_container
+
+
+@do_across_groups
+def _projection_page(conn: BlitzGateway, hql: str, params: Dict[str, Any],
+                     offset: int, limit: int,
+                     across_groups: Optional[bool] = True) -> List[List[Any]]:
+    """Run one page of an HQL projection."""
+    return conn.getQueryService().projection(
+        hql, _parameters(params, limit, offset), conn.SERVICE_OPTS)
+
+
+def _iter_ids(conn: BlitzGateway, hql: str, params: Dict[str, Any],
+              page_size: int, across_groups: Optional[bool]) -> Iterator[int]:
+    """Yield the first column of an ordered HQL projection, page by page.
+
+    Only one page of results is held at a time. Each page is its own
+    query, so the group is only switched while a page is being fetched,
+    never between two ``next`` calls.
+    """
+    offset = 0
+    while True:
+        results = _projection_page(conn, hql, params, offset, page_size,
+                                   across_groups=across_groups)
+        yield from _first_values(results)
+        if len(results) < page_size:
+            return
+        offset += page_size
+
+
+def _check_containers(kind: str, containers: dict,
+                      required: bool = False) -> Optional[str]:
+    """Return the one container kind set in `containers`, if any.
+
+    Raises ``ValueError`` if more than one is set, or if none is and `kind`
+    has no query for that case (or `required` is True).
+    """
+    given = [k for k, v in containers.items() if v is not None]
+    if len(given) == 1:
+        return given[0]
+    names = '/'.join(_CONTAINER_NAMES[k].title().replace(' ', '')
+                     for k in containers)
+    if given:
+        raise ValueError(f'Only one of {names} can be specified')
+    if required or None not in _ID_QUERIES[kind]:
+        raise ValueError(f'One of {names} must be specified')
+    return None
+
+
+def _get_ids(conn: BlitzGateway, kind: str, **containers) -> List[int]:
+    """Return IDs of `kind` objects inside the one container specified.
+
+    `containers` maps container kinds to IDs (or None). If none is set, the
+    `None` query of `kind` is used, if there is one.
+    """
+    container = _check_containers(kind, containers)
+    if container is None:
+        return _projection_ids(conn, _ID_QUERIES[kind][None])
+    container_id = containers[container]
+    container_id = _require_int(
+        container_id, f'{_CONTAINER_NAMES[container]} ID must be integer')
+    return _container_ids(conn, kind, container, [container_id])[container_id]
+
+
+def _iter_container_ids(conn: BlitzGateway, kind: str, page_size: int,
+                        across_groups: Optional[bool],
+                        **containers) -> Iterator[int]:
+    """Generator version of `_get_ids`, fetching `page_size` IDs at a time.
+
+    Arguments are checked right away, not on the first ``next`` call.
+    """
+    container = _check_containers(kind, containers, required=True)
+    container_id = _require_int(
+        containers[container],
+        f'{_CONTAINER_NAMES[container]} ID must be integer')
+    page_size = _require_int(page_size, 'Page size must be an integer')
+    if page_size < 1:
+        raise ValueError('Page size must be positive')
+    obj_col, container_col, from_clause, distinct = \
+        _ID_QUERIES[kind][container]
+    hql = (f"{_select(distinct)} {obj_col} {from_clause}"
+           f" WHERE {container_col}=:id ORDER BY {obj_col}")
+    return _iter_ids(conn, hql, {'id': rlong(container_id)}, page_size,
+                     across_groups)
+
+
+def _get_ids_batch(conn: BlitzGateway, kind: str,
+                   **containers) -> Dict[int, List[int]]:
+    """Batch version of `_get_ids`, taking lists of container IDs."""
+    container = _check_containers(kind, containers, required=True)
+    container_ids = containers[container]
+    message = f'{_CONTAINER_NAMES[container]} IDs must be a list of integers'
+    if not isinstance(container_ids, (list, tuple)):
+        raise TypeError(message)
+    container_ids = [_require_int(c, message) for c in container_ids]
+    return _container_ids(conn, kind, container, container_ids)
+
+
 @do_across_groups
 def get_image_ids(conn: BlitzGateway, project: Optional[int] = None,
                   dataset: Optional[int] = None,
@@ -391,107 +1008,68 @@ def get_image_ids(conn: BlitzGateway, project: Optional[int] = None,
 
     >>> tag_ims = get_image_ids(conn, annotation=876)
     """
-    arg_counter = 0
+    return _get_ids(conn, 'image', project=project, dataset=dataset,
+                    plate=plate, well=well,
+                    plate_acquisition=plate_acquisition,
+                    annotation=annotation)
 
-    for arg in [project, dataset, plate, well, plate_acquisition, annotation]:
-        if arg is not None:
-            arg_counter += 1
-    if arg_counter > 1:
-        raise ValueError('Only one of Project/Dataset/Plate/Well'
-                         '/PlateAcquisition/Annotation can be specified')
 
-    q = conn.getQueryService()
-    params = Parameters()
+@do_across_groups
+def get_image_ids_batch(conn: BlitzGateway,
+                        projects: Optional[List[int]] = None,
+                        datasets: Optional[List[int]] = None,
+                        plates: Optional[List[int]] = None,
+                        wells: Optional[List[int]] = None,
+                        plate_acquisitions: Optional[List[int]] = None,
+                        annotations: Optional[List[int]] = None,
+                        across_groups: Optional[bool] = True
+                        ) -> Dict[int, List[int]]:
+    """Return the IDs of images in each of several containers.
+
+    Unlike calling ``get_image_ids`` once per container, all containers are
+    looked up with a single query to the server. Exactly one of
+    `projects`, `datasets`, `plates`, `wells`, `plate_acquisitions` or
+    `annotations` must be specified.
 
-    if project is not None:
-        if not isinstance(project, int):
-            raise TypeError('Project ID must be integer')
-        params.map = {"project": rlong(project)}
-        results = q.projection(
-            "SELECT i.id FROM Project p"
-            " JOIN p.datasetLinks pdl"
-            " JOIN pdl.child d"
-            " JOIN d.imageLinks dil"
-            " JOIN dil.child i"
-            " WHERE p.id=:project",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif dataset is not None:
-        if not isinstance(dataset, int):
-            raise TypeError('Dataset ID must be integer')
-        params.map = {"dataset": rlong(dataset)}
-        results = q.projection(
-            "SELECT i.id FROM Dataset d"
-            " JOIN d.imageLinks dil"
-            " JOIN dil.child i"
-            " WHERE d.id=:dataset",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif plate is not None:
-        if not isinstance(plate, int):
-            raise TypeError('Plate ID must be integer')
-        params.map = {"plate": rlong(plate)}
-        results = q.projection(
-            "SELECT i.id FROM Plate pl"
-            " JOIN pl.wells w"
-            " JOIN w.wellSamples ws"
-            " JOIN ws.image i"
-            " WHERE pl.id=:plate",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif well is not None:
-        if not isinstance(well, int):
-            raise TypeError('Well ID must be integer')
-        params.map = {"well": rlong(well)}
-        results = q.projection(
-            "SELECT i.id FROM Well w"
-            " JOIN w.wellSamples ws"
-            " JOIN ws.image i"
-            " WHERE w.id=:well",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif plate_acquisition is not None:
-        if not isinstance(plate_acquisition, int):
-            raise TypeError('Plate acquisition ID must be integer')
-        params.map = {"plate_acquisition": rlong(plate_acquisition)}
-        results = q.projection(
-            "SELECT i.id FROM WellSample ws"
-            " JOIN ws.image i"
-            " JOIN ws.plateAcquisition pa"
-            " WHERE pa.id=:plate_acquisition",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM ImageAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-    else:
-        results = q.projection(
-            "SELECT i.id FROM Image i"
-            " WHERE NOT EXISTS ("
-            " SELECT dil FROM DatasetImageLink dil"
-            " WHERE dil.child=i.id"
-            " )"
-            " AND NOT EXISTS ("
-            " SELECT ws from WellSample ws"
-            " WHERE ws.image=i.id"
-            " )",
-            params,
-            conn.SERVICE_OPTS
-            )
-
-    return [r[0].val for r in results]
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    projects : list of int, optional
+        IDs of Projects for which to return image IDs.
+    datasets : list of int, optional
+        IDs of Datasets for which to return image IDs.
+    plates : list of int, optional
+        IDs of Plates for which to return image IDs.
+    wells : list of int, optional
+        IDs of Wells for which to return image IDs.
+    plate_acquisitions : list of int, optional
+        IDs of Plate acquisitions for which to return image IDs.
+    annotations : list of int, optional
+        IDs of Annotations for which to return image IDs.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    im_ids : dict
+        Maps each requested container ID to the list of IDs of the images
+        it contains. Containers with no (accessible) images map to an empty
+        list.
+
+    Examples
+    --------
+    # Return IDs of all images in Datasets 10 and 11:
+
+    >>> ds_ims = get_image_ids_batch(conn, datasets=[10, 11])
+    >>> ds_ims[10]
+    [1, 2, 3]
+    """
+    return _get_ids_batch(conn, 'image', project=projects, dataset=datasets,
+                          plate=plates, well=wells,
+                          plate_acquisition=plate_acquisitions,
+                          annotation=annotations)
 
 
 @do_across_groups
@@ -526,26 +1104,7 @@ def get_project_ids(conn: BlitzGateway,
 
     >>> proj_ids = get_project_ids(conn, annotation=576)
     """
-
-    q = conn.getQueryService()
-    params = Parameters()
-
-    if annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM ProjectAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-        proj_ids = [r[0].val for r in results]
-    else:
-        proj_ids = []
-        for p in conn.listProjects():
-            proj_ids.append(p.getId())
-    return proj_ids
+    return _get_ids(conn, 'project', annotation=annotation)
 
 
 @do_across_groups
@@ -586,50 +1145,7 @@ def get_dataset_ids(conn: BlitzGateway, project: Optional[int] = None,
 
     >>> ds_ids = get_dataset_ids(conn, project=224)
     """
-    arg_counter = 0
-    for arg in [project, annotation]:
-        if arg is not None:
-            arg_counter += 1
-    if arg_counter > 1:
-        raise ValueError('Only one of Project/Annotation'
-                         ' can be specified')
-
-    q = conn.getQueryService()
-    params = Parameters()
-
-    if project is not None:
-        if not isinstance(project, int):
-            raise TypeError('Project ID must be integer')
-        params.map = {"project": rlong(project)}
-        results = q.projection(
-            "SELECT d.id FROM Project p"
-            " JOIN p.datasetLinks pdl"
-            " JOIN pdl.child d"
-            " WHERE p.id=:project",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM DatasetAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-    else:
-        results = q.projection(
-            "SELECT d.id FROM Dataset d"
-            " WHERE NOT EXISTS ("
-            " SELECT pdl FROM ProjectDatasetLink pdl"
-            " WHERE pdl.child=d.id"
-            " )",
-            params,
-            conn.SERVICE_OPTS
-            )
-    return [r[0].val for r in results]
+    return _get_ids(conn, 'dataset', project=project, annotation=annotation)
 
 
 @do_across_groups
@@ -663,26 +1179,7 @@ def get_screen_ids(conn: BlitzGateway, annotation: Optional[int] = None,
 
     >>> proj_ids = get_screen_ids(conn, annotation=913)
     """
-
-    q = conn.getQueryService()
-    params = Parameters()
-
-    if annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM ScreenAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-        scrn_ids = [r[0].val for r in results]
-    else:
-        scrn_ids = []
-        for s in conn.listScreens():
-            scrn_ids.append(s.getId())
-    return scrn_ids
+    return _get_ids(conn, 'screen', annotation=annotation)
 
 
 @do_across_groups
@@ -722,50 +1219,7 @@ def get_plate_ids(conn: BlitzGateway, screen: Optional[int] = None,
 
     >>> pl_ids = get_plate_ids(conn, screen=224)
     """
-    arg_counter = 0
-    for arg in [screen, annotation]:
-        if arg is not None:
-            arg_counter += 1
-    if arg_counter > 1:
-        raise ValueError('Only one of Screen/Annotation'
-                         ' can be specified')
-
-    q = conn.getQueryService()
-    params = Parameters()
-
-    if screen is not None:
-        if not isinstance(screen, int):
-            raise TypeError('Screen ID must be integer')
-        params.map = {"screen": rlong(screen)}
-        results = q.projection(
-            "SELECT p.id FROM Screen s"
-            " JOIN s.plateLinks spl"
-            " JOIN spl.child p"
-            " WHERE s.id=:screen",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM PlateAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-    else:
-        results = q.projection(
-            "SELECT p.id FROM Plate p"
-            " WHERE NOT EXISTS ("
-            " SELECT spl FROM ScreenPlateLink spl"
-            " WHERE spl.child=p.id"
-            " )",
-            params,
-            conn.SERVICE_OPTS
-            )
-    return [r[0].val for r in results]
+    return _get_ids(conn, 'plate', screen=screen, annotation=annotation)
 
 
 @do_across_groups
@@ -802,55 +1256,8 @@ def get_well_ids(conn: BlitzGateway, screen: Optional[int] = None,
 
     >>> wl_ids = get_well_ids(conn, screen=224)
     """
-    arg_counter = 0
-    for arg in [screen, plate, annotation]:
-        if arg is not None:
-            arg_counter += 1
-    if arg_counter > 1:
-        raise ValueError('Only one of Screen/Plate/Annotation'
-                         ' can be specified')
-    elif arg_counter == 0:
-        raise ValueError('One of Screen/Plate/Annotation'
-                         ' must be specified')
-
-    q = conn.getQueryService()
-    params = Parameters()
-
-    if screen is not None:
-        if not isinstance(screen, int):
-            raise TypeError('Screen ID must be integer')
-        params.map = {"screen": rlong(screen)}
-        results = q.projection(
-            "SELECT w.id FROM Screen s"
-            " JOIN s.plateLinks spl"
-            " JOIN spl.child p"
-            " JOIN p.wells w"
-            " WHERE s.id=:screen",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif plate is not None:
-        if not isinstance(plate, int):
-            raise TypeError('Plate ID must be integer')
-        params.map = {"plate": rlong(plate)}
-        results = q.projection(
-            "SELECT w.id FROM Plate p"
-            " JOIN p.wells w"
-            " WHERE p.id=:plate",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM WellAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-    return [r[0].val for r in results]
+    return _get_ids(conn, 'well', screen=screen, plate=plate,
+                    annotation=annotation)
 
 
 @do_across_groups
@@ -891,61 +1298,148 @@ def get_plate_acquisition_ids(
 
     >>> plate_acquisition_ids = get_plate_acquisition_ids(conn, screen=224)
     """
-    arg_counter = 0
-    for arg in [screen, plate, annotation]:
-        if arg is not None:
-            arg_counter += 1
-    if arg_counter > 1:
-        raise ValueError('Only one of Screen/Plate/Annotation'
-                         ' can be specified')
-    elif arg_counter == 0:
-        raise ValueError('One of Screen/Plate/Annotation'
-                         ' must be specified')
+    return _get_ids(conn, 'plate_acquisition', screen=screen, plate=plate,
+                    annotation=annotation)
+
+
+def iter_well_ids(conn: BlitzGateway, screen: Optional[int] = None,
+                  plate: Optional[int] = None,
+                  annotation: Optional[int] = None,
+                  page_size: int = ID_PAGE_SIZE,
+                  across_groups: Optional[bool] = True) -> Iterator[int]:
+    """Iterate over well ids of a container, fetching them in pages
+
+    Generator version of ``get_well_ids`` for very large screens: IDs are
+    fetched `page_size` at a time, in increasing order, so the full list
+    never has to be held in memory.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    screen : int, optional
+        ID of Screen from which to return well IDs.
+    plate : int, optional
+        ID of Plate from which to return well IDs.
+    annotation : int, optional
+        ID of Annotation from which to return well IDs.
+    page_size : int, optional
+        Number of IDs fetched from the server per query.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    wl_ids : iterator of ints
+
+    Examples
+    --------
+    >>> for wl_id in iter_well_ids(conn, screen=224):
+    ...     print(wl_id)
+    """
+    return _iter_container_ids(conn, 'well', page_size, across_groups,
+                               screen=screen, plate=plate,
+                               annotation=annotation)
 
+
+def iter_plate_acquisition_ids(
+    conn: BlitzGateway, screen: Optional[int] = None,
+    plate: Optional[int] = None, annotation: Optional[int] = None,
+    page_size: int = ID_PAGE_SIZE, across_groups: Optional[bool] = True
+) -> Iterator[int]:
+    """Iterate over plate acquisition ids of a container, in pages
+
+    Generator version of ``get_plate_acquisition_ids``; see
+    ``iter_well_ids``.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    screen : int, optional
+        ID of Screen from which to return plate acquisition IDs.
+    plate : int, optional
+        ID of Plate from which to return plate acquisition IDs.
+    annotation : int, optional
+        ID of Annotation from which to return plate acquisition IDs.
+    page_size : int, optional
+        Number of IDs fetched from the server per query.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    plate_acquisition_ids : iterator of ints
+    """
+    return _iter_container_ids(conn, 'plate_acquisition', page_size,
+                               across_groups, screen=screen, plate=plate,
+                               annotation=annotation)
+
+
+# OMERO types that can be annotated, keyed by the lower-case names accepted
+# by ``BlitzGateway.getObject``
+_ANNOTATABLE_TYPES = {t.lower(): t for t in (
+    'Project', 'Dataset', 'Image', 'Screen', 'Plate', 'Well',
+    'PlateAcquisition', 'Roi', 'Shape', 'Folder', 'Fileset', 'Channel',
+    'Experimenter', 'ExperimenterGroup')}
+
+
+def _project_anns(conn: BlitzGateway, object_type: str, object_id: int,
+                  ann_class: str, ns: Optional[str] = None,
+                  select: str = "a.id", join: str = "",
+                  order: str = "") -> List[List[Any]]:
+    """Project `select` over `ann_class` annotations (``a``) of an object.
+
+    Type and namespace are filtered by the server, so only matching rows are
+    sent back rather than every annotation of the object. Rows come in link
+    order, then in `order`. Raises ``TypeError`` on invalid arguments.
+    """
+    if type(object_type) is not str:
+        raise TypeError('Object type must be a string')
+    object_id = _require_int(object_id, 'Object id must be an integer')
+    if ns is not None and type(ns) is not str:
+        raise TypeError('Namespace must be a string or None')
+    # only known type names may end up in the query
+    link_table = _ANNOTATABLE_TYPES.get(object_type.lower())
+    if link_table is None:
+        raise ValueError(f"unsupported object_type {object_type!r}")
     q = conn.getQueryService()
     params = Parameters()
-
-    if screen is not None:
-        if not isinstance(screen, int):
-            raise TypeError('Screen ID must be integer')
-        params.map = {"screen": rlong(screen)}
-        results = q.projection(
-            "SELECT r.id FROM Screen s"
-            " JOIN s.plateLinks spl"
-            " JOIN spl.child p"
-            " JOIN p.plateAcquisitions r"
-            " WHERE s.id=:screen",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif plate is not None:
-        if not isinstance(plate, int):
-            raise TypeError('Plate ID must be integer')
-        params.map = {"plate": rlong(plate)}
-        results = q.projection(
-            "SELECT r.id FROM Plate p"
-            " JOIN p.plateAcquisitions r"
-            " WHERE p.id=:plate",
-            params,
-            conn.SERVICE_OPTS
-            )
-    elif annotation is not None:
-        if not isinstance(annotation, int):
-            raise TypeError('Annotation ID must be integer')
-        params.map = {"annotation": rlong(annotation)}
-        results = q.projection(
-            "SELECT l.parent.id FROM PlateAcquisitionAnnotationLink l"
-            " WHERE l.child.id=:annotation",
-            params,
-            conn.SERVICE_OPTS
-            )
-    return [r[0].val for r in results]
+    params.map = {"oid": rlong(object_id)}
+    hql = (f"SELECT {select} FROM {link_table}AnnotationLink l,"
+           f" {ann_class} a{join} WHERE l.child=a AND l.parent.id=:oid")
+    if ns is not None:
+        params.map["ns"] = rstring(ns)
+        hql += " AND a.ns=:ns"
+    return q.projection(hql + " ORDER BY l.id" + order, params,
+                        conn.SERVICE_OPTS)
+
+
+def _get_ann_ids(conn: BlitzGateway, object_type: str, object_id: int,
+                 ann_class: str, ns: Optional[str] = None) -> List[int]:
+    """Return IDs of `ann_class` annotations linked to an object."""
+    return _first_values(
+        _project_anns(conn, object_type, object_id, ann_class, ns))
+
+
+def _add_map_value(map_annotation_dict: dict, key: str, value: str) -> None:
+    """Add a key-value pair, turning repeated keys into lists of values."""
+    if key in map_annotation_dict:
+        if not isinstance(map_annotation_dict[key], list):
+            map_annotation_dict[key] = [map_annotation_dict[key]]
+        map_annotation_dict[key].append(value)
+    else:
+        map_annotation_dict[key] = value
 
 
 @do_across_groups
 def get_map_annotation_ids(conn: BlitzGateway, object_type: str,
                            object_id: int, ns: Optional[str] = None,
-                           across_groups: Optional[bool] = True) -> List[int]:
+                           include_values: bool = False,
+                           across_groups: Optional[bool] = True
+                           ) -> Union[List[int], List[Tuple[int, dict]]]:
     """Get IDs of map annotations associated with an object
 
     Parameters
@@ -953,11 +1447,16 @@ def get_map_annotation_ids(conn: BlitzGateway, object_type: str,
     conn : ``omero.gateway.BlitzGateway`` object
         OMERO connection.
     object_type : str
-        OMERO object type, passed to ``BlitzGateway.getObject``
+        OMERO object type, e.g. ``'Image'`` or ``'Dataset'``. Raises
+        ``ValueError`` for types that cannot be annotated.
     object_id : int
         ID of object of ``object_type``.
     ns : str, optional
         Namespace with which to filter results
+    include_values : bool, optional
+        If True, also return the value of each map annotation, fetched in
+        the same query as the IDs. This avoids a separate
+        ``get_map_annotation`` call per ID.
     across_groups : bool, optional
         Defines cross-group behavior of function - set to
         ``False`` to disable it.
@@ -965,6 +1464,10 @@ def get_map_annotation_ids(conn: BlitzGateway, object_type: str,
     Returns
     -------
     map_ann_ids : list of ints
+        If `include_values` is True, a list of ``(id, kv_dict)`` tuples
+        instead, with ``kv_dict`` in the format returned by
+        ``get_map_annotation``.
+        Empty if the object does not exist.
 
     Examples
     --------
@@ -975,20 +1478,26 @@ def get_map_annotation_ids(conn: BlitzGateway, object_type: str,
     # Return IDs of map annotations with namespace "test" linked to a Dataset:
 
     >>> map_ann_ids = get_map_annotation_ids(conn, 'Dataset', 16, ns='test')
+
+    # Return IDs and values of all map annotations belonging to an image:
+
+    >>> for ma_id, kv in get_map_annotation_ids(conn, 'Image', 42,
+    ...                                         include_values=True):
+    ...     print(ma_id, kv)
     """
-    if type(object_type) is not str:
-        raise TypeError('Object type must be a string')
-    if type(object_id) is not int:
-        raise TypeError('Object id must be an integer')
-    if ns is not None and type(ns) is not str:
-        raise TypeError('Namespace must be a string or None')
+    if not include_values:
+        return _get_ann_ids(conn, object_type, object_id, 'MapAnnotation', ns)
 
-    target_object = conn.getObject(object_type, object_id)
-    map_ann_ids = []
-    for ann in target_object.listAnnotations(ns):
-        if ann.OMERO_TYPE is MapAnnotationI:
-            map_ann_ids.append(ann.getId())
-    return map_ann_ids
+    results = _project_anns(conn, object_type, object_id, 'MapAnnotation', ns,
+                            select="a.id, mv.name, mv.value",
+                            join=" LEFT JOIN a.mapValue mv",
+                            order=", index(mv)")
+    map_annotation_dicts: Dict[int, dict] = {}
+    for r in results:
+        map_annotation_dict = map_annotation_dicts.setdefault(r[0].val, {})
+        if r[1] is not None:
+            _add_map_value(map_annotation_dict, unwrap(r[1]), unwrap(r[2]))
+    return list(map_annotation_dicts.items())
 
 
 @do_across_groups
@@ -1002,7 +1511,8 @@ def get_tag_ids(conn: BlitzGateway, object_type: str, object_id: int,
     conn : ``omero.gateway.BlitzGateway`` object
         OMERO connection.
     object_type : str
-        OMERO object type, passed to ``BlitzGateway.getObject``
+        OMERO object type, e.g. ``'Image'`` or ``'Dataset'``. Raises
+        ``ValueError`` for types that cannot be annotated.
     object_id : int
         ID of object of ``object_type``.
     ns : str, optional
@@ -1014,6 +1524,7 @@ def get_tag_ids(conn: BlitzGateway, object_type: str, object_id: int,
     Returns
     -------
     tag_ids : list of ints
+        Empty if the object does not exist.
 
     Examples
     --------
@@ -1025,19 +1536,7 @@ def get_tag_ids(conn: BlitzGateway, object_type: str, object_id: int,
 
     >>> tag_ids = get_tag_ids(conn, 'Dataset', 16, ns='test')
     """
-    if type(object_type) is not str:
-        raise TypeError('Object type must be a string')
-    if type(object_id) is not int:
-        raise TypeError('Object id must be an integer')
-    if ns is not None and type(ns) is not str:
-        raise TypeError('Namespace must be a string or None')
-
-    target_object = conn.getObject(object_type, object_id)
-    tag_ids = []
-    for ann in target_object.listAnnotations(ns):
-        if ann.OMERO_TYPE is TagAnnotationI:
-            tag_ids.append(ann.getId())
-    return tag_ids
+    return _get_ann_ids(conn, object_type, object_id, 'TagAnnotation', ns)
 
 
 @do_across_groups
@@ -1052,7 +1551,8 @@ def get_comment_annotation_ids(conn: BlitzGateway, object_type: str,
     conn : ``omero.gateway.BlitzGateway`` object
         OMERO connection.
     object_type : str
-        OMERO object type, passed to ``BlitzGateway.getObject``
+        OMERO object type, e.g. ``'Image'`` or ``'Dataset'``. Raises
+        ``ValueError`` for types that cannot be annotated.
     object_id : int
         ID of object of ``object_type``.
     ns : str, optional
@@ -1064,6 +1564,7 @@ def get_comment_annotation_ids(conn: BlitzGateway, object_type: str,
     Returns
     -------
     comment_ids : list of ints
+        Empty if the object does not exist.
 
     Examples
     --------
@@ -1075,19 +1576,7 @@ def get_comment_annotation_ids(conn: BlitzGateway, object_type: str,
 
     >>> tag_ids = get_tag_ids(conn, 'Dataset', 16, ns='test')
     """
-    if type(object_type) is not str:
-        raise TypeError('Object type must be a string')
-    if type(object_id) is not int:
-        raise TypeError('Object id must be an integer')
-    if ns is not None and type(ns) is not str:
-        raise TypeError('Namespace must be a string or None')
-
-    target_object = conn.getObject(object_type, object_id)
-    comment_ids = []
-    for ann in target_object.listAnnotations(ns):
-        if ann.OMERO_TYPE is CommentAnnotationI:
-            comment_ids.append(ann.getId())
-    return comment_ids
+    return _get_ann_ids(conn, object_type, object_id, 'CommentAnnotation', ns)
 
 
 @do_across_groups
@@ -1101,7 +1590,8 @@ def get_file_annotation_ids(conn: BlitzGateway, object_type: str,
     conn : ``omero.gateway.BlitzGateway`` object
         OMERO connection.
     object_type : str
-        OMERO object type, passed to ``BlitzGateway.getObject``
+        OMERO object type, e.g. ``'Image'`` or ``'Dataset'``. Raises
+        ``ValueError`` for types that cannot be annotated.
     object_id : int
         ID of object of ``object_type``.
     ns : str, optional
@@ -1113,6 +1603,7 @@ def get_file_annotation_ids(conn: BlitzGateway, object_type: str,
     Returns
     -------
     file_ann_ids : list of ints
+        Empty if the object does not exist.
 
     Examples
     --------
@@ -1124,19 +1615,7 @@ def get_file_annotation_ids(conn: BlitzGateway, object_type: str,
 
     >>> file_ann_ids = get_file_annotation_ids(conn, 'Dataset', 16, ns='test')
     """
-    if type(object_type) is not str:
-        raise TypeError('Object type must be a string')
-    if type(object_id) is not int:
-        raise TypeError('Object id must be an integer')
-    if ns is not None and type(ns) is not str:
-        raise TypeError('Namespace must be a string or None')
-
-    target_object = conn.getObject(object_type, object_id)
-    file_ann_ids = []
-    for ann in target_object.listAnnotations(ns):
-        if isinstance(ann, FileAnnotationWrapper):
-            file_ann_ids.append(ann.getId())
-    return file_ann_ids
+    return _get_ann_ids(conn, object_type, object_id, 'FileAnnotation', ns)
 
 
 @do_across_groups
@@ -1160,29 +1639,12 @@ def get_well_id(conn: BlitzGateway, plate_id: int, row: int, column: int,
     well_id : int
         ID of well being queried.
     """
-    if not isinstance(plate_id, int):
-        raise TypeError('Plate ID must be an integer')
-    if not isinstance(row, int):
-        raise TypeError('Row index must be an integer')
-    if not isinstance(column, int):
-        raise TypeError('Column index must be an integer')
-    q = conn.getQueryService()
-    params = Parameters()
-    params.map = {"plate": rlong(plate_id),
-                  "row": rint(row),
-                  "column": rint(column)}
-    results = q.projection(
-        "SELECT w.id FROM Plate pl"
-        " JOIN pl.wells w"
-        " WHERE pl.id=:plate"
-        " AND w.row=:row"
-        " AND w.column=:column",
-        params,
-        conn.SERVICE_OPTS
-        )
-    if len(results) == 0:
-        return None
-    return [r[0].val for r in results][0]
+    plate_id = _require_int(plate_id, 'Plate ID must be an integer')
+    row = _require_int(row, 'Row index must be an integer')
+    column = _require_int(column, 'Column index must be an integer')
+    results = _project(conn, 'well_id', limit=1, plate=rlong(plate_id),
+                       row=rint(row), column=rint(column))
+    return results[0][0].val if results else None
 
 
 @do_across_groups
@@ -1204,6 +1666,10 @@ def get_roi_ids(conn: BlitzGateway, image_id: int,
     -------
     roi_ids : list of ints
 
+    See Also
+    --------
+    get_roi_shape_map : ROI IDs and their shape IDs in a single query.
+
     Examples
     --------
     # Return IDs of all ROIs linked to an image:
@@ -1211,8 +1677,7 @@ def get_roi_ids(conn: BlitzGateway, image_id: int,
     >>> roi_ids = get_roi_ids(conn, 42)
 
     """
-    if not isinstance(image_id, int):
-        raise TypeError('Image ID must be an integer')
+    image_id = _require_int(image_id, 'Image ID must be an integer')
     roi_ids = []
     roi_svc = conn.getRoiService()
     roi_list = roi_svc.findByImage(image_id, None)
@@ -1241,6 +1706,10 @@ def get_shape_ids(conn: BlitzGateway, roi_id: int,
     -------
     shape_ids : list of ints
 
+    See Also
+    --------
+    get_roi_shape_map : shape IDs of all ROIs of an image in a single query.
+
     Examples
     --------
     # Return IDs of all shapes linked to an ROI:
@@ -1248,20 +1717,87 @@ def get_shape_ids(conn: BlitzGateway, roi_id: int,
     >>> shape_ids = get_shape_ids(conn, 4222)
 
     """
-    if not isinstance(roi_id, int):
-        raise TypeError('ROI ID must be an integer')
-    q = conn.getQueryService()
-    params = Parameters()
-    params.map = {"roi_id": rlong(roi_id)}
-    results = q.projection(
-        "SELECT s.id FROM Shape s"
-        " WHERE s.roi.id=:roi_id",
-        params,
-        conn.SERVICE_OPTS
-        )
+    roi_id = _require_int(roi_id, 'ROI ID must be an integer')
+    results = _project(conn, 'shape_ids', roi_id=rlong(roi_id))
     if len(results) == 0:
         return None
-    return [r[0].val for r in results]
+    return _first_values(results)
+
+
+def iter_shape_ids(conn: BlitzGateway, roi_id: int,
+                   page_size: int = ID_PAGE_SIZE,
+                   across_groups: Optional[bool] = True) -> Iterator[int]:
+    """Iterate over shape ids of an ROI, fetching them in pages
+
+    Generator version of ``get_shape_ids``; see ``iter_well_ids``. Yields
+    nothing if the ROI has no shapes or cannot be found.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    roi_id : int
+        ID of ``ROI``.
+    page_size : int, optional
+        Number of IDs fetched from the server per query.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    shape_ids : iterator of ints
+    """
+    roi_id = _require_int(roi_id, 'ROI ID must be an integer')
+    page_size = _require_int(page_size, 'Page size must be an integer')
+    if page_size < 1:
+        raise ValueError('Page size must be positive')
+    return _iter_ids(conn, _HQL['shape_ids'], {'roi_id': rlong(roi_id)},
+                     page_size, across_groups)
+
+
+@do_across_groups
+def get_roi_shape_map(conn: BlitzGateway, image_id: int,
+                      across_groups: Optional[bool] = True
+                      ) -> Dict[int, List[int]]:
+    """Get IDs of all ROIs of an Image together with their shape IDs
+
+    Everything is fetched with a single query to the server, which is
+    much faster than calling ``get_shape_ids`` for each ID returned by
+    ``get_roi_ids``.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    image_id : int
+        ID of ``Image``.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    roi_shapes : dict
+        Maps the ID of each ROI linked to the image to the list of IDs of
+        its shapes. ROIs without shapes map to an empty list.
+
+    Examples
+    --------
+    # Loop over all shapes of all ROIs of an image:
+
+    >>> roi_shapes = get_roi_shape_map(conn, 42)
+    >>> for roi_id, shape_ids in roi_shapes.items():
+    ...     shapes = [get_shape(conn, s) for s in shape_ids]
+    """
+    image_id = _require_int(image_id, 'Image ID must be an integer')
+    results = _project(conn, 'roi_shape_ids', imid=rlong(image_id))
+    roi_shapes: Dict[int, List[int]] = {}
+    for roi_id, shape_id in results:
+        shape_ids = roi_shapes.setdefault(roi_id.val, [])
+        if shape_id is not None:
+            shape_ids.append(shape_id.val)
+    return roi_shapes
 
 
 @do_across_groups
@@ -1292,27 +1828,68 @@ def get_map_annotation(conn: BlitzGateway, map_ann_id: int,
     >>> print(ma_dict)
     {'testkey': 'testvalue', 'testkey2': ['testvalue2'. 'testvalue3']}
     """
-    if type(map_ann_id) is not int:
-        raise TypeError('Map annotation ID must be an integer')
+    map_ann_id = _require_int(
+        map_ann_id, 'Map annotation ID must be an integer')
+    return get_map_annotations(conn, [map_ann_id],
+                               across_groups=False)[map_ann_id]
 
-    map_annotation_dict = {}
 
-    map_annotation = conn.getObject('MapAnnotation', map_ann_id).getValue()
+@do_across_groups
+def get_map_annotations(conn: BlitzGateway, map_ann_ids: List[int],
+                        across_groups: Optional[bool] = True
+                        ) -> Dict[int, dict]:
+    """Get the values of several map annotation objects at once
 
-    for item in map_annotation:
-        if item[0] in map_annotation_dict:
-            if not isinstance(map_annotation_dict[item[0]], list):
-                map_annotation_dict[item[0]] = [map_annotation_dict[item[0]]]
-            map_annotation_dict[item[0]].append(item[1])
-        else:
-            map_annotation_dict[item[0]] = item[1]
+    All annotations are fetched with a single query to the server, which is
+    much faster than calling ``get_map_annotation`` once per ID.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    map_ann_ids : list of int
+        IDs of map annotations to get.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    kv_dicts : dict
+        Maps each requested map annotation ID to its value, as a Python
+        dict in the format returned by ``get_map_annotation``. Annotations
+        that cannot be found map to an empty dict.
+
+    Examples
+    --------
+    >>> ma_ids = get_map_annotation_ids(conn, 'Image', 42)
+    >>> ma_dicts = get_map_annotations(conn, ma_ids)
+    >>> print(ma_dicts[ma_ids[0]])
+    {'testkey': 'testvalue', 'testkey2': ['testvalue2'. 'testvalue3']}
+    """
+    if not isinstance(map_ann_ids, (list, tuple)):
+        raise TypeError('Map annotation IDs must be a list of integers')
+    map_ann_ids = [_require_int(i, 'Map annotation IDs must be a list of '
+                                   'integers') for i in map_ann_ids]
 
-    return map_annotation_dict
+    map_annotation_dicts: Dict[int, dict] = {i: {} for i in map_ann_ids}
+    if not map_ann_ids:
+        return map_annotation_dicts
+
+    # fetch just the key-value pairs instead of loading whole annotations
+    results = _project(conn, 'map_values',
+                       ids=rlist([rlong(i) for i in map_annotation_dicts]))
+
+    for r in results:
+        _add_map_value(map_annotation_dicts[r[0].val], unwrap(r[1]),
+                       unwrap(r[2]))
+
+    return map_annotation_dicts
 
 
 @do_across_groups
 def get_tag(conn: BlitzGateway, tag_id: int,
-            across_groups: Optional[bool] = True) -> str:
+            across_groups: Optional[bool] = True) -> Optional[str]:
     """Get the value of a tag annotation object
 
     Parameters
@@ -1328,7 +1905,8 @@ def get_tag(conn: BlitzGateway, tag_id: int,
     Returns
     -------
     tag : str
-        The value of the specified tag annotation object.
+        The value of the specified tag annotation object, or None if it
+        cannot be found.
 
     Examples
     --------
@@ -1336,15 +1914,16 @@ def get_tag(conn: BlitzGateway, tag_id: int,
     >>> print(tag)
     This_is_a_tag
     """
-    if type(tag_id) is not int:
-        raise TypeError('Tag ID must be an integer')
+    tag_id = _require_int(tag_id, 'Tag ID must be an integer')
 
-    return conn.getObject('TagAnnotation', tag_id).getValue()
+    results = _project(conn, 'tag_value', id=rlong(tag_id))
+    return unwrap(results[0][0]) if results else None
 
 
 @do_across_groups
 def get_comment_annotation(conn: BlitzGateway, comment_id: int,
-                           across_groups: Optional[bool] = True) -> str:
+                           across_groups: Optional[bool] = True
+                           ) -> Optional[str]:
     """Get the value of a comment annotation object
 
     Parameters
@@ -1360,7 +1939,8 @@ def get_comment_annotation(conn: BlitzGateway, comment_id: int,
     Returns
     -------
     comment : str
-        The value of the specified tag annotation object.
+        The value of the specified comment annotation object, or None if it
+        cannot be found.
 
     Examples
     --------
@@ -1368,10 +1948,10 @@ def get_comment_annotation(conn: BlitzGateway, comment_id: int,
     >>> print(comment)
     This is a comment
     """
-    if type(comment_id) is not int:
-        raise TypeError('Comment ID must be an integer')
+    comment_id = _require_int(comment_id, 'Comment ID must be an integer')
 
-    return conn.getObject('CommentAnnotation', comment_id).getValue()
+    results = _project(conn, 'comment_value', id=rlong(comment_id))
+    return unwrap(results[0][0]) if results else None
 
 
 @do_across_groups
@@ -1406,19 +1986,54 @@ def get_file_annotation(conn: BlitzGateway, file_ann_id: int,
     >>> print(attch_path)
     '/home/user/Downloads/attachment.txt'
     """
-    if type(file_ann_id) is not int:
-        raise TypeError('File annotation ID must be an integer')
+    file_ann_id = _require_int(
+        file_ann_id, 'File annotation ID must be an integer')
 
     if not folder_path or not os.path.exists(folder_path):
         folder_path = os.path.dirname(__file__)
     ann = conn.getObject('FileAnnotation', file_ann_id)
     file_path = os.path.join(folder_path, ann.getFile().getName())
     with open(str(file_path), 'wb') as f:
-        for chunk in ann.getFileInChunks():
-            f.write(chunk)
+        _write_chunks(ann.getFileInChunks(), f)
     return file_path
 
 
+def _write_chunks(chunks: Iterable[bytes], f: BinaryIO) -> None:
+    """Write `chunks` to `f`, downloading the next chunk during each write.
+
+    Chunks are handed to a writer thread through a queue bounded by
+    `MAX_QUEUED_CHUNKS`, so memory use stays bounded if the disk is slower
+    than the network. Exceptions from either side are re-raised here.
+    """
+    pending: queue.Queue = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+    errors: List[BaseException] = []
+
+    def write():
+        while True:
+            chunk = pending.get()
+            if chunk is None:
+                return
+            # keep draining after a failure so the producer never blocks
+            if not errors:
+                try:
+                    f.write(chunk)
+                except BaseException as e:
+                    errors.append(e)
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            pending.put(chunk)
+    finally:
+        pending.put(None)
+        writer.join()
+    if errors:
+        raise errors[0]
+
+
 def get_group_id(conn: BlitzGateway, group_name: str) -> Union[int, None]:
     """Get ID of a group based on group name.
 
@@ -1436,6 +2051,11 @@ def get_group_id(conn: BlitzGateway, group_name: str) -> Union[int, None]:
     group_id : int
         ID of the OMERO group. Returns `None` if group cannot be found.
 
+    Notes
+    -----
+    IDs found are cached per connection for a minute, so repeated calls
+    with the same name do not go back to the server.
+
     Examples
     --------
     >>> get_group_id(conn, "Research IT")
@@ -1444,12 +2064,8 @@ def get_group_id(conn: BlitzGateway, group_name: str) -> Union[int, None]:
     if type(group_name) is not str:
         raise TypeError('OMERO group name must be a string')
 
-    try:
-        g = conn.c.sf.getAdminService().lookupGroup(group_name)
-        return g.id.val
-    except ApiUsageException:
-        pass
-    return None
+    return _lookup_id(conn, 'group', group_name,
+                      conn.c.sf.getAdminService().lookupGroup)
 
 
 def get_user_id(conn: BlitzGateway, user_name: str) -> Union[int, None]:
@@ -1469,6 +2085,11 @@ def get_user_id(conn: BlitzGateway, user_name: str) -> Union[int, None]:
     user_id : int
         ID of the OMERO user. Returns `None` if group cannot be found.
 
+    Notes
+    -----
+    IDs found are cached per connection for a minute, so repeated calls
+    with the same name do not go back to the server.
+
     Examples
     --------
     >>> get_user_id(conn, "jaxl")
@@ -1477,18 +2098,17 @@ def get_user_id(conn: BlitzGateway, user_name: str) -> Union[int, None]:
     if type(user_name) is not str:
         raise TypeError('OMERO user name must be a string')
 
-    for u in conn.containedExperimenters(1):
-        if u.getName() == user_name:
-            return u.getId()
-    return None
+    return _lookup_id(conn, 'user', user_name,
+                      conn.c.sf.getAdminService().lookupExperimenter)
 
 
 @do_across_groups
 def get_original_filepaths(
     conn: BlitzGateway, image_id: int,
     fpath: Optional[Literal["client", "repo"]] = 'repo',
+    split: bool = False,
     across_groups: Optional[bool] = True
-) -> List[str]:
+) -> Union[List[str], List[Tuple[str, str]]]:
     """Get paths to original files for specified image.
 
     Parameters
@@ -1502,6 +2122,9 @@ def get_original_filepaths(
         repository ('repo') or the path from which the image was imported
         ('client'). The latter is useful for images that were imported by
         the "in place" method. Defaults to 'repo'.
+    split : bool, optional
+        If True, return each path as a ``(directory, filename)`` tuple
+        instead of a single string. The directory keeps its trailing '/'.
     across_groups : bool, optional
         Defines cross-group behavior of function - set to
         ``False`` to disable it.
@@ -1516,7 +2139,7 @@ def get_original_filepaths(
 
     Returns
     -------
-    original_filepaths : list of str
+    original_filepaths : list of str, or list of (str, str) tuples
 
     Examples
     --------
@@ -1530,42 +2153,29 @@ def get_original_filepaths(
     >>> get_original_filepaths(conn, 2201, fpath='client')
     ['/client/omero/smith_lab/stack2/PJN17_083_07.ndpi']
 
-    """
-    if type(image_id) is not int:
-        raise TypeError('Image ID must be an integer')
+    # Return directory and file name separately:
 
-    q = conn.getQueryService()
-    params = Parameters()
-    params.map = {"imid": rlong(image_id)}
+    >>> get_original_filepaths(conn, 745, split=True)
+    [('djme_2/2020-06/16/13-38-36.468/', 'PJN17_083_07.ndpi')]
+
+    """
+    image_id = _require_int(image_id, 'Image ID must be an integer')
 
     if fpath == 'client':
-        results = q.projection(
-            "SELECT fe.clientPath"
-            " FROM Image i"
-            " JOIN i.fileset f"
-            " JOIN f.usedFiles fe"
-            " WHERE i.id=:imid",
-            params,
-            conn.SERVICE_OPTS
-            )
-        results = ['/' + r[0].val for r in results]
+        results = _project(conn, 'client_paths', imid=rlong(image_id))
+        paths = ['/' + r[0].val for r in results]
+        if split:
+            return [(d + '/', n) for d, _, n in
+                    (p.rpartition('/') for p in paths)]
+        return paths
     elif fpath == 'repo':
-        results = q.projection(
-            "SELECT o.path||o.name"
-            " FROM Image i"
-            " JOIN i.fileset f"
-            " JOIN f.usedFiles fe"
-            " JOIN fe.originalFile o"
-            " WHERE i.id=:imid",
-            params,
-            conn.SERVICE_OPTS
-            )
-        results = [r[0].val for r in results]
+        results = _project(conn, 'repo_paths', imid=rlong(image_id))
+        if split:
+            return [(r[0].val, r[1].val) for r in results]
+        return [r[0].val + r[1].val for r in results]
     else:
         raise ValueError("Parameter fpath must be 'client' or 'repo'")
 
-    return results
-
 
 @do_across_groups
 def get_series_index(conn: BlitzGateway, image_id: int,
@@ -1602,22 +2212,9 @@ def get_series_index(conn: BlitzGateway, image_id: int,
     2
     """
 
-    if type(image_id) is not int:
-        raise TypeError('Image ID must be an integer')
+    image_id = _require_int(image_id, 'Image ID must be an integer')
 
-    q = conn.getQueryService()
-    params = Parameters()
-    params.map = {"imid": rlong(image_id)}
-
-    results = q.projection(
-        "SELECT i.series"
-        " FROM Image i"
-        " JOIN i.fileset f"
-        " JOIN f.usedFiles fe"
-        " WHERE i.id=:imid AND index(fe)=0",
-        params,
-        conn.SERVICE_OPTS
-        )
+    results = _project(conn, 'series_index', imid=rlong(image_id))
     if results:
         series_idx = results[0][0].val
     else:
@@ -1645,7 +2242,7 @@ def get_pyramid_levels(conn: BlitzGateway, image_id: int,
     -------
     levels : list of tuples
         Pyramidal levels available for this image, with number of
-        pixels for X and Y axes.
+        pixels for X and Y axes. Empty if the image cannot be loaded.
 
     Examples
     --------
@@ -1655,18 +2252,21 @@ def get_pyramid_levels(conn: BlitzGateway, image_id: int,
     [(2048, 1600), (1024, 800), (512, 400), (256, 200)]
 
     """
-    image = conn.getObject("image", image_id)
-    pix = image._conn.c.sf.createRawPixelsStore()
-    pid = image.getPixelsId()
-    pix.setPixelsId(pid, False)
+    image_id = _require_int(image_id, 'Image ID must be an integer')
+    # only the Pixels ID is needed, so skip loading the image itself
+    results = _project(conn, 'pixels_id', imid=rlong(image_id))
+    if len(results) == 0:
+        logging.warning(f'Cannot load image {image_id} - '
+                        'check if you have permissions to do so')
+        return []
     levels: List[Tuple[int, ...]]
-    levels = [(r.sizeX, r.sizeY) for r in pix.getResolutionDescriptions()]
-    pix.close()
+    levels = list(_resolution_levels(conn, results[0][0].val))
     return levels
 
 
 @do_across_groups
 def get_table(conn: BlitzGateway, file_ann_id: int,
+              as_columns: bool = False,
               across_groups: Optional[bool] = True
               ) -> Any:
     """Get a table from its FileAnnotation object.
@@ -1677,6 +2277,11 @@ def get_table(conn: BlitzGateway, file_ann_id: int,
         OMERO connection.
     file_ann_id : int
         ID of FileAnnotation table to get.
+    as_columns : bool, optional
+        If True, return the table as a dict mapping each column name to a
+        numpy array of its values, whether or not pandas is installed. This
+        keeps the column layout the table is read in and skips building
+        rows.
     across_groups : bool, optional
         Defines cross-group behavior of function - set to
         ``False`` to disable it.
@@ -1686,24 +2291,32 @@ def get_table(conn: BlitzGateway, file_ann_id: int,
     table : object
         Object containing the actual table. It can be either a list of
         row-lists or a pandas Dataframe in case the optional pandas dependency
-        was installed.
+        was installed, or a dict of column arrays if `as_columns` is True.
 
     Examples
     --------
     >>> table = get_table(conn, 62)
     >>> print(table[0])
     ['ID', 'X', 'Y']
+
+    # Get the columns as numpy arrays:
+
+    >>> columns = get_table(conn, 62, as_columns=True)
+    >>> print(columns['X'].mean())
+    12.5
     """
-    if type(file_ann_id) is not int:
-        raise TypeError('File annotation ID must be an integer')
-    ann = conn.getObject('FileAnnotation', file_ann_id)
+    file_ann_id = _require_int(
+        file_ann_id, 'File annotation ID must be an integer')
+    results = _project(conn, 'ann_file_id', id=rlong(file_ann_id))
     table = None
-    if ann:
-        orig_table_file = conn.getObject('OriginalFile', ann.getFile().id)
+    if results:
+        # openTable only needs the file ID, so pass an unloaded OriginalFile
+        # rather than loading the annotation and its file first
+        orig_table_file = OriginalFileI(results[0][0].val, False)
         resources = conn.c.sf.sharedResources()
         try:
-            table_obj = resources.openTable(orig_table_file._obj)
-            table = _create_table(table_obj)
+            table_obj = resources.openTable(orig_table_file)
+            table = _create_table(table_obj, as_columns)
             table_obj.close()
         except InternalException:
             logging.warning(f" FileAnnotation {file_ann_id} is not a table.")
@@ -1746,151 +2359,184 @@ def get_shape(conn: BlitzGateway, shape_id: int,
     >>> shape = get_shape(conn, 634443)
 
     """
-    if not isinstance(shape_id, int):
-        raise TypeError('Shape ID must be an integer')
+    shape_id = _require_int(shape_id, 'Shape ID must be an integer')
     omero_shape = conn.getObject('Shape', shape_id)
     return _omero_shape_to_shape(omero_shape)
 
 
-def _create_table(table_obj: Table
+@do_across_groups
+def get_shapes(conn: BlitzGateway, shape_ids: List[int],
+               across_groups: Optional[bool] = True
+               ) -> Dict[int, Optional[ezShape]]:
+    """Get ezomero shape objects for several OMERO Shape ids at once
+
+    All shapes are loaded with a single query to the server, which is much
+    faster than calling ``get_shape`` once per ID.
+
+    Parameters
+    ----------
+    conn : ``omero.gateway.BlitzGateway`` object
+        OMERO connection.
+    shape_ids : list of int
+        IDs of shapes to get.
+    across_groups : bool, optional
+        Defines cross-group behavior of function - set to
+        ``False`` to disable it.
+
+    Returns
+    -------
+    shapes : dict
+        Maps each requested shape ID to an object of one of the ezomero
+        shape classes, as returned by ``get_shape``. Shapes that cannot be
+        found map to None.
+
+    Examples
+    --------
+    >>> roi_shapes = get_roi_shape_map(conn, 42)
+    >>> for roi_id, shape_ids in roi_shapes.items():
+    ...     shapes = get_shapes(conn, shape_ids)
+    """
+    if not isinstance(shape_ids, (list, tuple)):
+        raise TypeError('Shape IDs must be a list of integers')
+    shape_ids = [_require_int(i, 'Shape IDs must be a list of integers')
+                 for i in shape_ids]
+
+    shapes: Dict[int, Optional[ezShape]] = {i: None for i in shape_ids}
+    if not shape_ids:
+        return shapes
+    for omero_shape in conn.getObjects('Shape', list(shapes)):
+        shapes[omero_shape.getId()] = _omero_shape_to_shape(omero_shape)
+    return shapes
+
+
+def _create_table(table_obj: Table, as_columns: bool = False
                   ) -> Any:
+    columns = [col.name for col in table_obj.getHeaders()]
+    rowCount = table_obj.getNumberOfRows()
+    # read `TABLE_CHUNK_ROWS` rows at a time, so no single reply has to
+    # hold the whole table (and stay under Ice's message size limit)
+    col_ids = list(range(len(columns)))
+    values: List[List[Any]] = [[] for _ in columns]
+    for start in range(0, rowCount, TABLE_CHUNK_ROWS):
+        stop = min(start + TABLE_CHUNK_ROWS, rowCount)
+        data = table_obj.read(col_ids, start, stop)
+        for col_values, col in zip(values, data.columns):
+            col_values.extend(col.values)
+    if as_columns:
+        return {name: np.asarray(v) for name, v in zip(columns, values)}
     if importlib.util.find_spec('pandas'):
-        columns = []
-        for col in table_obj.getHeaders():
-            columns.append(col.name)
-        table = pd.DataFrame(columns=columns)
-        rowCount = table_obj.getNumberOfRows()
-        data = table_obj.read(list(range(len(columns))), 0, rowCount)
-        for col in data.columns:
-            col_data = []
-            for v in col.values:
-                col_data.append(v)
-            table[col.name] = col_data
-
+        # build the frame in one go from the column lists; array columns
+        # keep one list per cell, as before
+        table = pd.DataFrame(dict(zip(columns, values)), columns=columns)
     else:
-        table = []
-        columns = []
-        data_lists = []
-        for col in table_obj.getHeaders():
-            columns.append(col.name)
-        table.append(columns)
-        rowCount = table_obj.getNumberOfRows()
-        data = table_obj.read(list(range(len(columns))), 0, rowCount)
-        for col in data.columns:
-            col_data = []
-            for v in col.values:
-                col_data.append(v)
-            data_lists.append(col_data)
-        # transpose data_lists
-        data_lists = [list(i) for i in zip(*data_lists)]
-        for row in data_lists:
-            table.append(row)
+        # header row, then the columns transposed into rows; zip and map
+        # keep the per-cell work in C
+        table = [columns]
+        table.extend(map(list, zip(*values)))
 
     return table
 
 
-def _omero_shape_to_shape(omero_shape: Shape
-                          ) -> ezShape:
-    """ Helper function to convert ezomero shapes into omero shapes"""
-    shape_type = omero_shape.ice_id().split("::omero::model::")[1]
+def _omero_points(omero_shape: Shape) -> List[Tuple[float, float]]:
+    """ Parse the points string of a Polygon or Polyline """
+    # "x1,y1 x2,y2 ..." parsed by numpy in one pass, rather than one
+    # float() call per coordinate; a bad token raises ValueError
+    coords = np.array(omero_shape.points.replace(',', ' ').split(),
+                      dtype=float)
+    if coords.size % 2:
+        raise ValueError(f'Malformed points string {omero_shape.points!r}')
+    return list(map(tuple, coords.reshape(-1, 2).tolist()))
+
+
+# each builder takes (omero_shape, z, c, t, text, fill_color, stroke_color,
+# stroke_width) and returns the ezomero shape, reading only the fields that
+# shape type has
+
+def _build_point(omero_shape, z, c, t, text, fill, stroke, width) -> Point:
+    return Point(omero_shape.x, omero_shape.y, z, c, t, text, fill, stroke,
+                 width)
+
+
+def _build_line(omero_shape, z, c, t, text, fill, stroke, width) -> Line:
+    return Line(omero_shape.x1, omero_shape.y1, omero_shape.x2,
+                omero_shape.y2, z, c, t,
+                getattr(omero_shape, 'markerStart', None),
+                getattr(omero_shape, 'markerEnd', None),
+                text, fill, stroke, width)
+
+
+def _build_rectangle(omero_shape, z, c, t, text, fill, stroke,
+                     width) -> Rectangle:
+    return Rectangle(omero_shape.x, omero_shape.y, omero_shape.width,
+                     omero_shape.height, z, c, t, text, fill, stroke, width)
+
+
+def _build_ellipse(omero_shape, z, c, t, text, fill, stroke, width) -> Ellipse:
+    return Ellipse(omero_shape.x, omero_shape.y, omero_shape.radiusX,
+                   omero_shape.radiusY, z, c, t, text, fill, stroke, width)
+
+
+def _build_polygon(omero_shape, z, c, t, text, fill, stroke, width) -> Polygon:
+    return Polygon(_omero_points(omero_shape), z, c, t, text, fill, stroke,
+                   width)
+
+
+def _build_polyline(omero_shape, z, c, t, text, fill, stroke,
+                    width) -> Polyline:
+    return Polyline(_omero_points(omero_shape), z, c, t, text, fill, stroke,
+                    width)
+
+
+def _build_label(omero_shape, z, c, t, text, fill, stroke, width) -> Label:
+    fsize = omero_shape.getFontSize().getValue()
+    return Label(omero_shape.x, omero_shape.y, text, fsize, z, c, t, fill,
+                 stroke, width)
+
+
+# OMERO model class name -> builder, used by `_omero_shape_to_shape`
+_SHAPE_BUILDERS: Dict[str, Callable[..., ezShape]] = {
+    'Point': _build_point,
+    'Line': _build_line,
+    'Rectangle': _build_rectangle,
+    'Ellipse': _build_ellipse,
+    'Polygon': _build_polygon,
+    'Polyline': _build_polyline,
+    'Label': _build_label,
+}
+# the same, keyed on the full Ice type ID, so shapes are dispatched on
+# ``ice_id()`` as is, without splitting it for every shape
+_ICE_SHAPE_BUILDERS: Dict[str, Callable[..., ezShape]] = {
+    f'::omero::model::{name}': build for name, build in _SHAPE_BUILDERS.items()
+}
+
+
+def _omero_shape_to_shape(omero_shape: Shape) -> ezShape:
+    """ Helper function to convert ezomero shapes into omero shapes """
     fill_color = _int_to_rgba(omero_shape.getFillColor(), True)
     stroke_color = _int_to_rgba(omero_shape.getStrokeColor(), False)
-    try:
-        stroke_width = omero_shape.getStrokeWidth().getValue()
-    except AttributeError:
-        stroke_width = 1
-    try:
-        z_val = omero_shape.theZ
-    except AttributeError:
-        z_val = None
-    try:
-        c_val = omero_shape.theC
-    except AttributeError:
-        c_val = None
-    try:
-        t_val = omero_shape.theT
-    except AttributeError:
-        t_val = None
-    try:
-        text = omero_shape.textValue
-    except AttributeError:
-        text = None
-    try:
-        mk_start = omero_shape.markerStart
-    except AttributeError:
-        mk_start = None
-    try:
-        mk_end = omero_shape.markerEnd
-    except AttributeError:
-        mk_end = None
-    shape: Union[Point, Line, Rectangle, Ellipse, Polygon, Polyline, Label]
-    if shape_type == "Point":
-        x = omero_shape.x
-        y = omero_shape.y
-        shape = Point(x, y, z_val, c_val, t_val, text, fill_color,
-                      stroke_color, stroke_width)
-    elif shape_type == "Line":
-        x1 = omero_shape.x1
-        x2 = omero_shape.x2
-        y1 = omero_shape.y1
-        y2 = omero_shape.y2
-        shape = Line(x1, y1, x2, y2, z_val, c_val, t_val, mk_start, mk_end,
-                     text, fill_color, stroke_color, stroke_width)
-    elif shape_type == "Rectangle":
-        x = omero_shape.x
-        y = omero_shape.y
-        width = omero_shape.width
-        height = omero_shape.height
-        shape = Rectangle(x, y, width, height, z_val, c_val, t_val, text,
-                          fill_color, stroke_color, stroke_width)
-    elif shape_type == "Ellipse":
-        x = omero_shape.x
-        y = omero_shape.y
-        radiusX = omero_shape.radiusX
-        radiusY = omero_shape.radiusY
-        shape = Ellipse(x, y, radiusX, radiusY, z_val, c_val, t_val, text,
-                        fill_color, stroke_color, stroke_width)
-    elif shape_type == "Polygon":
-        omero_points = omero_shape.points.split()
-        points = []
-        for point in omero_points:
-            coords = point.split(',')
-            points.append((float(coords[0]), float(coords[1])))
-        shape = Polygon(points, z_val, c_val, t_val, text, fill_color,
-                        stroke_color, stroke_width)
-    elif shape_type == "Polyline":
-        omero_points = omero_shape.points.split()
-        points = []
-        for point in omero_points:
-            coords = point.split(',')
-            points.append((float(coords[0]), float(coords[1])))
-        shape = Polyline(points, z_val, c_val, t_val, text, fill_color,
-                         stroke_color, stroke_width)
-    elif shape_type == "Label":
-        x = omero_shape.x
-        y = omero_shape.y
-        fsize = omero_shape.getFontSize().getValue()
-        shape = Label(x, y, text, fsize, z_val, c_val, t_val, fill_color,
-                      stroke_color, stroke_width)
-    else:
+    width = omero_shape.getStrokeWidth()
+    stroke_width = width.getValue() if width is not None else 1
+    # optional fields, None for shape types that do not have them
+    z_val = getattr(omero_shape, 'theZ', None)
+    c_val = getattr(omero_shape, 'theC', None)
+    t_val = getattr(omero_shape, 'theT', None)
+    text = getattr(omero_shape, 'textValue', None)
+    build = _ICE_SHAPE_BUILDERS.get(omero_shape.ice_id())
+    if build is None:
         err = 'The shape passed for the roi is not a valid shape type'
         raise TypeError(err)
-    return shape
+    return build(omero_shape, z_val, c_val, t_val, text, fill_color,
+                 stroke_color, stroke_width)
 
 
+# shapes mostly reuse a handful of colors, so decoded colors are memoized;
+# the tuples returned are immutable and safe to share
+@functools.lru_cache(maxsize=1024)
 def _int_to_rgba(omero_val: Union[int, None], is_fill: bool) -> \
         Tuple[int, int, int, int]:
     """ Helper function returning the color as an Integer in RGBA encoding """
-    if omero_val:
-        if omero_val < 0:
-            omero_val = omero_val + (2**32)
-        r = omero_val >> 24
-        g = omero_val - (r << 24) >> 16
-        b = omero_val - (r << 24) - (g << 16) >> 8
-        a = omero_val - (r << 24) - (g << 16) - (b << 8)
-        return (r, g, b, a)
-    else:
-        if is_fill:
-            return (0, 0, 0, 0)
-        else:
-            return (255, 255, 0, 255)
+    if omero_val is None:
+        return (0, 0, 0, 0) if is_fill else (255, 255, 0, 255)
+    # the mask also maps signed (negative) values to unsigned
+    v = omero_val & 0xFFFFFFFF
+    return (v >> 24, (v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
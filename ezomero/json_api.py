@@ -1,14 +1,13 @@
 import requests
 from requests import Session
-import os
 from typing import Optional, Tuple, Union
-import configparser
 import numpy as np
 from numbers import Number
 from getpass import getpass
 from pathlib import Path
 from PIL import Image
 from io import BytesIO
+from ._ezomero import _default_config_path, _read_config, _resolve_param
 
 
 def create_json_session(user: Optional[str] = None,
@@ -79,50 +78,40 @@ def create_json_session(user: Optional[str] = None,
        to discourage storing credentials in a file as cleartext.
 
     4) If any remaining parameters have not been set by the above steps, the
-       user is prompted to enter a value for each unset parameter.
+       user is prompted to enter a value for each unset parameter. If there
+       is no terminal to prompt on (e.g. in a batch job), a ``RuntimeError``
+       is raised instead of waiting for input.
 
     Note that, by default, this function will use the latest API version
     available, in case multiple versions are offered by the OMERO.web server.
     """
     # load from .ezomero config file if it exists
     if config_path is None:
-        config_fp = Path.home() / '.ezomero'
+        config_fp = _default_config_path()
     elif type(config_path) is str:
         config_fp = Path(config_path) / '.ezomero'
     else:
         raise TypeError('config_path must be a string')
 
-    config_dict: Union[None, configparser.SectionProxy] = None
-    if config_fp.exists():
-        config = configparser.ConfigParser()
-        with config_fp.open() as fp:
-            config.read_file(fp)
+    config_dict = None
+    config = _read_config(config_fp)
+    if config is not None:
         try:
             config_dict = config["JSON"]
         except KeyError:
             raise KeyError('.ezomero does not contain JSON information.')
 
     # set user
-    if user is None:
-        if config_dict:
-            user = config_dict.get("OMERO_USER", user)
-        user = os.environ.get("OMERO_USER", user)
-    if user is None:
-        user = input('Enter username: ')
-
-    # set password
-    if password is None:
-        password = os.environ.get("OMERO_PASS", password)
-    if password is None:
-        password = getpass('Enter password: ')
+    user = _resolve_param(user, "OMERO_USER", config_dict,
+                          'Enter username: ')
+
+    # set password (never read from the config file)
+    password = _resolve_param(password, "OMERO_PASS", None,
+                              'Enter password: ', getpass)
 
     # set web host
-    if web_host is None:
-        if config_dict:
-            web_host = config_dict.get("OMERO_WEB_HOST", web_host)
-        web_host = os.environ.get("OMERO_WEB_HOST", web_host)
-    if web_host is None:
-        web_host = input('Enter host: ')
+    web_host = _resolve_param(web_host, "OMERO_WEB_HOST", config_dict,
+                              'Enter host: ')
 
     session = requests.Session()
     # Start by getting supported versions from the base url...
@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass, field
 from typing import List, Tuple, Union
 
@@ -10,8 +11,14 @@ __all__ = ["Point",
            "Label",
            "ezShape"]
 
+# shapes are slotted (no per-instance __dict__) where dataclasses support
+# it; frozen slotted dataclasses only copy and pickle properly from 3.11
+_DATACLASS_OPTIONS = {'frozen': True}
+if sys.version_info >= (3, 11):
+    _DATACLASS_OPTIONS['slots'] = True
 
-@dataclass(frozen=True)
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ezShape:
     """Generic dataclass used to create an OMERO Shape.
 
@@ -22,7 +29,7 @@ class ezShape:
     """
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Point(ezShape):
     """A dataclass used to create an OMERO Point.
 
@@ -79,7 +86,7 @@ class Point(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Line(ezShape):
     """A dataclass used to create an OMERO Line.
 
@@ -148,7 +155,7 @@ class Line(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Rectangle(ezShape):
     """A dataclass used to create an OMERO rectangle.
 
@@ -212,7 +219,7 @@ class Rectangle(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Ellipse(ezShape):
     """A dataclass used to create an OMERO Ellipse.
 
@@ -276,7 +283,7 @@ class Ellipse(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Polygon(ezShape):
     """A dataclass used to create an OMERO polygon.
 
@@ -332,7 +339,7 @@ class Polygon(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Polyline(ezShape):
     """A dataclass used to create an OMERO polyline.
 
@@ -388,7 +395,7 @@ class Polyline(ezShape):
     stroke_width: Union[float, None] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(**_DATACLASS_OPTIONS)
 class Label(ezShape):
     """A dataclass used to create an OMERO Label.
 
@@ -0,0 +1,50 @@
+import asyncio
+import ezomero
+
+
+def test_aget_ids(conn, project_structure, screen_structure):
+    image_info = project_structure[2]
+    im_id = image_info[0][1]
+    plate_id = screen_structure[1]
+
+    async def gather():
+        return await asyncio.gather(
+            ezomero.aget_roi_ids(conn, im_id),
+            ezomero.aget_original_filepaths(conn, im_id),
+            ezomero.aget_well_ids(conn, plate=plate_id),
+            ezomero.aget_plate_acquisition_ids(conn, plate=plate_id))
+
+    group = conn.SERVICE_OPTS.getOmeroGroup()
+    roi_ids, paths, well_ids, pacq_ids = asyncio.run(gather())
+    assert roi_ids == ezomero.get_roi_ids(conn, im_id)
+    assert paths == ezomero.get_original_filepaths(conn, im_id)
+    assert set(well_ids) == set(ezomero.get_well_ids(conn, plate=plate_id))
+    assert set(pacq_ids) == set(ezomero.get_plate_acquisition_ids(
+        conn, plate=plate_id))
+    # group context is restored once all calls are done
+    assert conn.SERVICE_OPTS.getOmeroGroup() == group
+
+
+def test_aget_ids_mixed_groups(conn, project_structure):
+    image_info = project_structure[2]
+    im_id = image_info[0][1]
+
+    async def gather():
+        return await asyncio.gather(
+            ezomero.aget_roi_ids(conn, im_id),
+            ezomero.aget_roi_ids(conn, im_id, across_groups=False),
+            ezomero.aget_original_filepaths(conn, im_id),
+            ezomero.aget_original_filepaths(conn, im_id,
+                                            across_groups=False))
+
+    group = conn.SERVICE_OPTS.getOmeroGroup()
+    roi_ids, own_roi_ids, paths, own_paths = asyncio.run(gather())
+    # calls limited to the current group never see the -1 switch made for
+    # the others
+    assert roi_ids == ezomero.get_roi_ids(conn, im_id)
+    assert own_roi_ids == ezomero.get_roi_ids(conn, im_id,
+                                              across_groups=False)
+    assert paths == ezomero.get_original_filepaths(conn, im_id)
+    assert own_paths == ezomero.get_original_filepaths(conn, im_id,
+                                                       across_groups=False)
+    assert conn.SERVICE_OPTS.getOmeroGroup() == group
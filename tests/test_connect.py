@@ -1,7 +1,10 @@
+import io
 import pytest
 import os
+import sys
 import ezomero
 from pathlib import Path
+from omero.gateway import BlitzGateway
 
 
 def test_connect_params(omero_params, tmp_path, monkeypatch):
@@ -103,3 +106,134 @@ def test_store_conn_params(omero_params, tmp_path):
         ezomero.json_api.create_json_session(password=password,
                                              config_path=str(tmp_path))
     assert login_rsp['success']
+
+
+def test_read_config_cache(tmp_path):
+    conf_path = tmp_path / '.ezomero'
+    assert ezomero._ezomero._read_config(conf_path) is None
+    conf_path.write_text("[DEFAULT]\n"
+                         "omero_user = first\n"
+                         "omero_port = 4064\n")
+    config = ezomero._ezomero._read_config(conf_path)
+    assert config['DEFAULT'] == {'OMERO_USER': 'first', 'OMERO_PORT': '4064'}
+    # unchanged file should be served from the cache
+    assert ezomero._ezomero._read_config(conf_path) is config
+    conf_path.write_text("[DEFAULT]\n"
+                         "omero_user = second_user\n"
+                         "\n"
+                         "# web settings\n"
+                         "[JSON]\n"
+                         "omero_web_host = http://localhost\n")
+    config = ezomero._ezomero._read_config(conf_path)
+    assert config['DEFAULT'] == {'OMERO_USER': 'second_user'}
+    # sections inherit DEFAULT entries, as with configparser
+    assert config['JSON'] == {'OMERO_USER': 'second_user',
+                              'OMERO_WEB_HOST': 'http://localhost'}
+
+
+def test_connect_pool(omero_params, tmp_path):
+    user, password, host, web_host, port, secure = omero_params
+    conn = ezomero.connect(user, password, host=host, group='', port=port,
+                           secure=True, config_path=str(tmp_path), pool=True)
+    # memberships checked on the pooled session stay cached on a pool hit
+    key = (conn.host, conn.port, 1, 2)
+    ezomero._ezomero._group_membership[key] = True
+    # same parameters should hand back the pooled connection
+    conn2 = ezomero.connect(user, password, host=host, group='', port=port,
+                            secure=True, config_path=str(tmp_path), pool=True)
+    assert conn2 is conn
+    assert ezomero._ezomero._group_membership.pop(key)
+    # pooling is opt-in
+    conn3 = ezomero.connect(user, password, host=host, group='', port=port,
+                            secure=True, config_path=str(tmp_path))
+    assert conn3 is not conn
+    conn3.close()
+    # closing by one holder leaves the connection open for the other
+    conn.close()
+    assert conn2.isConnected()
+    assert conn2.getUser().getName() == user
+    ezomero.close_all()
+    assert not conn.isConnected()
+    # a closed connection should not be handed out again
+    conn4 = ezomero.connect(user, password, host=host, group='', port=port,
+                            secure=True, config_path=str(tmp_path), pool=True)
+    assert conn4 is not conn
+    assert conn4.getUser().getName() == user
+    conn4.close()
+    assert not conn4.isConnected()
+
+
+def test_reconnect(omero_params, tmp_path):
+    user, password, host, web_host, port, secure = omero_params
+    conn = ezomero.connect(user, password, host=host, group='', port=port,
+                           secure=True, config_path=str(tmp_path))
+    # live connection is handed back as-is
+    assert ezomero.reconnect(conn) is conn
+    # the session is still alive on the server, so it can be rejoined
+    conn.close(hard=False)
+    conn2 = ezomero.reconnect(conn)
+    assert conn2 is not conn
+    assert conn2.getUser().getName() == user
+    # without kept credentials, an ended session cannot be replaced
+    conn2.close()
+    assert ezomero.reconnect(conn2) is None
+    # with kept credentials, a new session is opened
+    conn = ezomero.connect(user, password, host=host, group='', port=port,
+                           secure=True, config_path=str(tmp_path),
+                           keep_credentials=True)
+    conn.close()
+    conn3 = ezomero.reconnect(conn)
+    assert conn3 is not conn
+    assert conn3.getUser().getName() == user
+    conn3.close()
+    with pytest.raises(ValueError):
+        ezomero.reconnect(BlitzGateway(user, password, host=host,
+                                       port=port))
+
+
+def test_connect_empty_port(tmp_path, monkeypatch):
+    # an empty OMERO_PORT is treated as unset and prompted for
+    monkeypatch.setenv("OMERO_PORT", "")
+    prompted = []
+
+    def fake_prompt(prompt, env_key, prompt_fn=input):
+        prompted.append(env_key)
+        return '4064'
+
+    opened = []
+    monkeypatch.setattr(ezomero._ezomero, '_prompt', fake_prompt)
+    monkeypatch.setattr(ezomero._ezomero, '_open_connection',
+                        lambda *args, **kwargs: opened.append(args))
+    ezomero.connect('user', 'password', group='', host='localhost',
+                    secure=True, config_path=str(tmp_path))
+    assert prompted == ['OMERO_PORT']
+    assert opened[0][4] == 4064
+
+
+def test_prompt_without_tty(monkeypatch):
+    # input needs a terminal, but a password can still be piped in
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('secret\n'))
+    with pytest.raises(RuntimeError):
+        ezomero._ezomero._prompt('Enter host: ', 'OMERO_HOST')
+    answer = ezomero._ezomero._prompt('Password: ', 'OMERO_PASSWORD',
+                                      lambda prompt: sys.stdin.readline())
+    assert answer == 'secret\n'
+
+
+def test_store_conn_params_without_tty(tmp_path, monkeypatch):
+    # missing parameters cannot be prompted for without a terminal
+    monkeypatch.setattr(sys, 'stdin', io.StringIO())
+    with pytest.raises(RuntimeError):
+        ezomero.store_connection_params(group="", host='localhost',
+                                        port=4064, secure=True,
+                                        config_path=str(tmp_path))
+    assert not (tmp_path / '.ezomero').exists()
+    ezomero.store_connection_params(user='user', group="", host='localhost',
+                                    port=4064, secure=True,
+                                    config_path=str(tmp_path))
+    # neither may the overwrite confirmation
+    with pytest.raises(RuntimeError):
+        ezomero.store_connection_params(user='user', group="",
+                                        host='localhost', port=4064,
+                                        secure=True,
+                                        config_path=str(tmp_path))
@@ -3,6 +3,7 @@ import numpy as np
 import ezomero
 from omero.gateway import TagAnnotationWrapper
 from io import StringIO
+from types import SimpleNamespace
 
 # Test gets
 ###########
@@ -96,11 +97,40 @@ def test_get_image(conn, project_structure, users_groups, pyramid_fixture):
     im, im_arr = ezomero.get_image(conn, pyr_id, dim_order='zxcyt',
                                    pyramid_level=1)
     assert im_arr.shape == (1, 8, 1, 8, 1)
+    im, im_arr = ezomero.get_image(conn, im_id, dim_order='tzyxc')
+    assert im_arr.shape == (1, 20, 201, 200, 3)
+    assert im_arr.flags.c_contiguous
+
+    # test contiguous
+    im, im_arr = ezomero.get_image(conn, im_id, dim_order='czxty')
+    im, im_arr2 = ezomero.get_image(conn, im_id, dim_order='czxty',
+                                    contiguous=True)
+    assert im_arr2.flags.c_contiguous
+    assert np.array_equal(im_arr, im_arr2)
+    im, im_arr = ezomero.get_image(conn, pyr_id, xyzct=True,
+                                   pyramid_level=1, contiguous=True)
+    assert im_arr.shape == (8, 8, 1, 1, 1)
+    assert im_arr.flags.c_contiguous
+
+    # test out
+    im, im_arr = ezomero.get_image(conn, im_id, dim_order='czxty')
+    buf = np.empty(im_arr.shape, dtype=im_arr.dtype)
+    im, im_arr2 = ezomero.get_image(conn, im_id, dim_order='czxty', out=buf)
+    assert im_arr2 is buf
+    assert np.array_equal(im_arr, buf)
+    with pytest.raises(ValueError):
+        _, _ = ezomero.get_image(conn, im_id, out=buf)
+    with pytest.raises(TypeError):
+        _, _ = ezomero.get_image(conn, im_id, out=[0])
 
     # test no pixels
     im, im_arr = ezomero.get_image(conn, im_id, no_pixels=True)
     assert im_arr is None
 
+    # numpy integer IDs (e.g. from a DataFrame) are accepted
+    im, _ = ezomero.get_image(conn, np.int64(im_id), no_pixels=True)
+    assert im.getId() == im_id
+
     # test that IndexError comes up when pad=False
     with pytest.raises(IndexError):
         im, im_arr = ezomero.get_image(conn, im_id,
@@ -163,6 +193,7 @@ def test_get_tag_and_tag_ids(conn, project_structure):
     tag_text = ezomero.get_tag(conn, tag_id)
 
     assert tag_text == 'test_tag'
+    assert ezomero.get_tag(conn, 999999999) is None
 
     conn.deleteObjects("Annotation",
                        [tag_id],
@@ -497,9 +528,19 @@ def test_get_well_ids(conn, screen_structure):
     plate_wl_ids = ezomero.get_well_ids(conn, plate=plate3_id)
     assert set(plate_wl_ids) == set([well_id4])
 
+    # Iterate in pages smaller than the result
+    with pytest.raises(TypeError):
+        _ = ezomero.iter_well_ids(conn, plate='test')
+    with pytest.raises(ValueError):
+        _ = ezomero.iter_well_ids(conn)
+    screen_wl_ids = list(ezomero.iter_well_ids(conn, screen=screen_id,
+                                               page_size=2))
+    assert screen_wl_ids == sorted([well_id1, well_id2, well_id3])
+
     # Return nothing on bad input
     bad_ids = ezomero.get_well_ids(conn, screen=999999)
     assert not bad_ids
+    assert not list(ezomero.iter_well_ids(conn, screen=999999))
 
     # Test get from tag annotation
     tag_ann = TagAnnotationWrapper(conn)
@@ -519,6 +560,28 @@ def test_get_well_ids(conn, screen_structure):
                        wait=True)
 
 
+def test_screen_ids_no_duplicates(conn, screen_structure):
+    # a screen with several plates reaches wells and plate acquisitions
+    # through several links, but every ID is returned once
+    screen_id = screen_structure[0]
+    well_ids = [screen_structure[7], screen_structure[10],
+                screen_structure[13]]
+    pacq_ids = [screen_structure[4], screen_structure[5],
+                screen_structure[6]]
+
+    screen_wl_ids = ezomero.get_well_ids(conn, screen=screen_id)
+    assert sorted(screen_wl_ids) == sorted(well_ids)
+    screen_wl_ids = list(ezomero.iter_well_ids(conn, screen=screen_id,
+                                               page_size=1))
+    assert screen_wl_ids == sorted(well_ids)
+
+    screen_pacq_ids = ezomero.get_plate_acquisition_ids(conn, screen=screen_id)
+    assert sorted(screen_pacq_ids) == sorted(pacq_ids)
+    screen_pacq_ids = list(ezomero.iter_plate_acquisition_ids(
+        conn, screen=screen_id, page_size=1))
+    assert screen_pacq_ids == sorted(pacq_ids)
+
+
 def test_get_plate_acquisition_ids(conn, screen_structure):
 
     screen_id = screen_structure[0]
@@ -543,6 +606,11 @@ def test_get_plate_acquisition_ids(conn, screen_structure):
     plate_pacq_ids = ezomero.get_plate_acquisition_ids(conn, plate=plate2_id)
     assert set(plate_pacq_ids) == set([pacq_id3])
 
+    # Iterate in pages smaller than the result
+    screen_pacq_ids = list(ezomero.iter_plate_acquisition_ids(
+        conn, screen=screen_id, page_size=2))
+    assert screen_pacq_ids == sorted([pacq_id1, pacq_id2, pacq_id3])
+
     # Return nothing on bad input
     bad_ids = ezomero.get_plate_acquisition_ids(conn, screen=999999)
     assert not bad_ids
@@ -566,6 +634,41 @@ def test_get_plate_acquisition_ids(conn, screen_structure):
                        wait=True)
 
 
+def test_get_image_ids_batch(conn, project_structure, screen_structure):
+    dataset_info = project_structure[1]
+    image_info = project_structure[2]
+    ds0_id = dataset_info[0][1]  # contains im0
+    ds3_id = dataset_info[3][1]  # contains im3, im4
+    im0_id = image_info[0][1]
+    im3_id = image_info[3][1]
+    im4_id = image_info[4][1]
+    ds_ims = ezomero.get_image_ids_batch(conn, datasets=[ds0_id, ds3_id,
+                                                         999999])
+    assert set(ds_ims[ds0_id]) == set([im0_id])
+    assert set(ds_ims[ds3_id]) == set([im3_id, im4_id])
+    assert ds_ims[999999] == []
+
+    # matches the one-at-a-time lookup
+    plate_ids = [screen_structure[1], screen_structure[2]]
+    plate_ims = ezomero.get_image_ids_batch(conn, plates=plate_ids)
+    for plate_id in plate_ids:
+        assert set(plate_ims[plate_id]) == \
+            set(ezomero.get_image_ids(conn, plate=plate_id))
+
+    assert ezomero.get_image_ids_batch(conn, wells=[]) == {}
+
+
+def test_get_image_ids_batch_params(conn):
+    with pytest.raises(ValueError):
+        _ = ezomero.get_image_ids_batch(conn)
+    with pytest.raises(ValueError):
+        _ = ezomero.get_image_ids_batch(conn, projects=[1], plates=[2])
+    with pytest.raises(TypeError):
+        _ = ezomero.get_image_ids_batch(conn, datasets=1)
+    with pytest.raises(TypeError):
+        _ = ezomero.get_image_ids_batch(conn, datasets=['test'])
+
+
 def test_get_image_ids_params(conn):
     with pytest.raises(ValueError):
         _ = ezomero.get_image_ids(conn, project=1, plate=2)
@@ -596,6 +699,14 @@ def test_get_map_annotation_and_ids(conn, project_structure):
         _ = ezomero.get_map_annotation_ids(conn, 'Image', '10')
     with pytest.raises(TypeError):
         _ = ezomero.get_map_annotation_ids(conn, 'Image', 10, ns=10)
+    with pytest.raises(ValueError):
+        _ = ezomero.get_map_annotation_ids(conn, 'NotAType', 10)
+    with pytest.raises(ValueError):
+        _ = ezomero.get_map_annotation_ids(conn, 'Image l, Project p', 10)
+    # objects that do not exist have no annotations
+    assert ezomero.get_map_annotation_ids(conn, 'Image', 999999999) == []
+    assert ezomero.get_map_annotation_ids(conn, 'Image', 999999999,
+                                          include_values=True) == []
 
     map_ann_id = ezomero.post_map_annotation(conn, "Image", im_id, kv, ns)
     map_ann_id2 = ezomero.post_map_annotation(conn, "Image", im_id, kv, ns)
@@ -607,6 +718,12 @@ def test_get_map_annotation_and_ids(conn, project_structure):
     good_ids = [map_ann_id, map_ann_id2, map_ann_id3]
     assert all([mid in map_ann_ids for mid in good_ids])
     assert map_ann_id4 not in map_ann_ids
+    with_values = ezomero.get_map_annotation_ids(conn, "Image", im_id, ns=ns,
+                                                 include_values=True)
+    assert [mid for mid, _ in with_values] == map_ann_ids
+    for _, mpann in with_values:
+        assert mpann["key1"] == kv["key1"]
+        assert sorted(mpann["key3"]) == sorted(kv["key3"])
 
     # Test sanitizing input
     with pytest.raises(TypeError):
@@ -615,6 +732,16 @@ def test_get_map_annotation_and_ids(conn, project_structure):
     assert mpann["key1"] == kv["key1"]
     assert mpann["key2"] == kv["key2"]
     assert sorted(mpann["key3"]) == sorted(kv["key3"])
+
+    # batch version
+    with pytest.raises(TypeError):
+        _ = ezomero.get_map_annotations(conn, map_ann_id)
+    with pytest.raises(TypeError):
+        _ = ezomero.get_map_annotations(conn, ['10'])
+    mpanns = ezomero.get_map_annotations(conn, good_ids + [999999])
+    for mid in good_ids:
+        assert mpanns[mid] == ezomero.get_map_annotation(conn, mid)
+    assert mpanns[999999] == {}
     conn.deleteObjects("Annotation",
                        [map_ann_id, map_ann_id2, map_ann_id3, map_ann_id4],
                        deleteAnns=True,
@@ -635,6 +762,8 @@ def test_get_comment_annotation_and_ids(conn, project_structure):
         _ = ezomero.get_comment_annotation_ids(conn, 'Image', '10')
     with pytest.raises(TypeError):
         _ = ezomero.get_comment_annotation_ids(conn, 'Image', 10, ns=10)
+    with pytest.raises(ValueError):
+        _ = ezomero.get_comment_annotation_ids(conn, 'NotAType', 10)
     with pytest.raises(TypeError):
         _ = ezomero.get_comment_annotation(conn, 'Image')
 
@@ -659,6 +788,7 @@ def test_get_comment_annotation_and_ids(conn, project_structure):
         _ = ezomero.get_comment_annotation(conn, '10')
     mpann = ezomero.get_comment_annotation(conn, comm_ann_ids[0])
     assert mpann == comment
+    assert ezomero.get_comment_annotation(conn, 999999999) is None
     conn.deleteObjects("Annotation",
                        [comm_ann_id, comm_ann_id2, comm_ann_id3, comm_ann_id4],
                        deleteAnns=True,
@@ -834,6 +964,8 @@ def test_get_shape_and_get_shape_ids(conn, project_structure,
                               description=roi_fixture['desc'])
     shape_ids = ezomero.get_shape_ids(conn, roi_id)
     assert len(shape_ids) == len(roi_fixture['shapes'])
+    assert list(ezomero.iter_shape_ids(conn, roi_id,
+                                       page_size=2)) == sorted(shape_ids)
     for i in range(len(shape_ids)):
         shape = ezomero.get_shape(conn, shape_ids[i])
         assert hasattr(shape, 'label')
@@ -842,6 +974,13 @@ def test_get_shape_and_get_shape_ids(conn, project_structure,
                 assert shape.fill_color == pre_shape.fill_color
                 assert shape.stroke_color == pre_shape.stroke_color
                 assert shape.stroke_width == pre_shape.stroke_width
+    with pytest.raises(TypeError):
+        _ = ezomero.get_shapes(conn, shape_ids[0])
+    batch_shapes = ezomero.get_shapes(conn, shape_ids + [999999999])
+    assert batch_shapes[999999999] is None
+    for shape_id in shape_ids:
+        shape = ezomero.get_shape(conn, shape_id)
+        assert batch_shapes[shape_id] == shape
     roi_id2 = ezomero.post_roi(conn, im_id,
                                shapes=[arrow],
                                name=roi_fixture['name'],
@@ -850,17 +989,24 @@ def test_get_shape_and_get_shape_ids(conn, project_structure,
     assert len(shape_ids2) == 1
     shape = ezomero.get_shape(conn, shape_ids2[0])
     assert shape.markerStart == "Arrow"
+    roi_shapes = ezomero.get_roi_shape_map(conn, im_id)
+    assert sorted(roi_shapes[roi_id]) == sorted(shape_ids)
+    assert roi_shapes[roi_id2] == shape_ids2
     # Test getting from an invalid cross-group
     username = users_groups[1][2][0]  # test_user3
     groupname = users_groups[0][1][0]  # test_group_2
     current_conn = conn.suConn(username, groupname)
     empty_ret = ezomero.get_shape_ids(current_conn, roi_id)
     assert empty_ret is None
+    assert ezomero.get_roi_shape_map(current_conn, im_id) == {}
     current_conn.close()
 
     # test getting from invalid IDs
     empty_ret = ezomero.get_shape_ids(conn, 999999999)
     assert empty_ret is None
+    assert ezomero.get_roi_shape_map(conn, 999999999) == {}
+    with pytest.raises(TypeError):
+        _ = ezomero.get_roi_shape_map(conn, '9999')
     with pytest.raises(AttributeError):
         _, _, _, _ = ezomero.get_shape(conn, 99999999)
 
@@ -868,12 +1014,28 @@ def test_get_shape_and_get_shape_ids(conn, project_structure,
                        deleteChildren=True, wait=True)
 
 
+def test_omero_points():
+    points = ezomero._gets._omero_points
+    shape = SimpleNamespace(points='1,2 3.5,4')
+    assert points(shape) == [(1.0, 2.0), (3.5, 4.0)]
+    # malformed strings are rejected rather than silently truncated
+    with pytest.raises(ValueError):
+        points(SimpleNamespace(points='1,2 3,x'))
+    with pytest.raises(ValueError):
+        points(SimpleNamespace(points='1,2 3'))
+
+
 def test_get_pyramid_levels(conn, pyramid_fixture):
     im_id = ezomero.get_image_ids(conn)[-1]
     lvls = ezomero.get_pyramid_levels(conn, im_id)
     assert len(lvls) == 3
     assert lvls[0] == (16, 16)
 
+    # cached levels match what get_image reads
+    _, pixels = ezomero.get_image(conn, im_id, pyramid_level=1)
+    assert ezomero.get_pyramid_levels(conn, im_id) == lvls
+    assert pixels.shape[2:4] == lvls[1][::-1]
+
 
 def test_get_original_filepaths_and_series_index(conn,
                                                  project_structure,
@@ -912,6 +1074,14 @@ def test_get_original_filepaths_and_series_index(conn,
     assert opath[0].endswith("test_pyramid.ome.tif")
     opath = ezomero.get_original_filepaths(conn, im_id, fpath='client')
     assert opath[0].endswith(fpath)
+    split_path = ezomero.get_original_filepaths(conn, im_id, fpath='client',
+                                                split=True)
+    assert ''.join(split_path[0]) == opath[0]
+    assert split_path[0][1] == "test_pyramid.ome.tif"
+    opath = ezomero.get_original_filepaths(conn, im_id)
+    split_path = ezomero.get_original_filepaths(conn, im_id, split=True)
+    assert ''.join(split_path[0]) == opath[0]
+    assert split_path[0][1] == "test_pyramid.ome.tif"
     series_idx = ezomero.get_series_index(conn, im_id)
     assert series_idx == 0
 
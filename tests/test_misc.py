@@ -1,3 +1,4 @@
+import typing
 import ezomero
 import pytest
 from omero.gateway import PlateWrapper
@@ -9,6 +10,14 @@ def test_omero_connection(conn, omero_params):
     assert conn.getUser().getName() == omero_params[0]
 
 
+def test_do_across_groups_metadata():
+    # decorated getters keep the wrapped function's signature metadata
+    f = ezomero.get_image_ids
+    assert f.__name__ == 'get_image_ids'
+    assert f.__annotations__ == f.__wrapped__.__annotations__
+    assert typing.get_type_hints(f) == typing.get_type_hints(f.__wrapped__)
+
+
 def test_filter_by_tag_value(conn, project_structure, users_groups):
     proj3_id = project_structure[0][3][1]
     im3_id = project_structure[2][3][1]
@@ -124,6 +133,20 @@ def test_set_group(conn, users_groups):
     new_group = users_groups[0][1][1]  # test_group_2
     ret = ezomero.set_group(current_conn, int(new_group))
     assert ret is True
+    # membership is remembered for later calls
+    user_id = current_conn.getUser().getId()
+    key = (current_conn.host, current_conn.port, user_id, int(new_group))
+    assert ezomero._ezomero._group_membership[key]
+    ret = ezomero.set_group(current_conn, int(new_group))
+    assert ret is True
+    # memberships on other servers are left alone
+    other = ('elsewhere', current_conn.port, user_id, int(new_group))
+    ezomero._ezomero._group_membership[other] = False
+    ezomero.invalidate_group_cache(current_conn)
+    assert key not in ezomero._ezomero._group_membership
+    assert ezomero._ezomero._group_membership[other] is False
+    ezomero.invalidate_group_cache()
+    assert not ezomero._ezomero._group_membership
     current_conn.close()
 
 
@@ -536,6 +536,10 @@ def test_post_get_table_nopandas(conn, project_structure, users_groups,
         return_ann = ezomero.get_table(conn, table_id)
         print(return_ann, tables[1])
         assert return_ann == tables[1]
+        columns = ezomero.get_table(conn, table_id, as_columns=True)
+        assert list(columns) == tables[1][0]
+        for i, name in enumerate(tables[1][0]):
+            assert columns[name].tolist() == [r[i] for r in tables[1][1:]]
 
         # Test posting to non-existing object
         im_id2 = 999999999